@@ -0,0 +1,93 @@
+"""Benchmarks run with ``manage.py bench <name>``.
+
+Each benchmark is a module in this package exposing ``help``,
+``add_arguments(parser)`` and ``run(stdout, **options)``.  The ``bench``
+command runs it against a throwaway test database, so benchmarks can create
+and delete rows freely without touching real data.
+"""
+
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from importlib import import_module
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+BENCHMARKS = [
+    "asgi",
+    "conditional",
+    "db_writes",
+    "explain",
+    "loadtest",
+    "logins",
+    "media",
+    "orders",
+    "payload",
+    "reaction_batch",
+    "reaction_buffer",
+    "reactions",
+    "search",
+    "sessions",
+]
+
+
+def load(name):
+    return import_module(f"{__name__}.{name}")
+
+
+@contextmanager
+def test_database(on_disk=False):
+    """Create the test database for a benchmark and destroy it afterwards.
+
+    ``on_disk`` puts an SQLite test database in a temporary file instead of
+    memory, so benchmarks that hit it from several threads get independent
+    connections and real file locking, as in production.
+    """
+    setup_test_environment()
+    if on_disk and connection.vendor == "sqlite":
+        fd, path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(fd)
+        connection.settings_dict["TEST"]["NAME"] = path
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        # Benchmarks read query counts from the header (see ``queries_of``).
+        with override_settings(SERVER_TIMING_HEADER=True):
+            yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def logged_in_client(account, client_class=Client):
+    """Return a test client whose session is logged in as ``account``."""
+    client = client_class()
+    session = client.session
+    session["user_id"] = account.pk
+    session.save()
+    client.cookies["sessionid"] = session.session_key
+    return client
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def queries_of(response):
+    """Queries a response took, from the ``Server-Timing`` header.
+
+    RequestMetricsMiddleware counts the queries of async views too, which run on
+    another thread's connection where CaptureQueriesContext cannot see them.
+    """
+    match = re.search(r'"(\d+) queries"', response.get("Server-Timing", ""))
+    return int(match.group(1)) if match else 0
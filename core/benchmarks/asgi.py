@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.test import AsyncClient
+
+from core.benchmarks import logged_in_client, percentile
+from core.models import Account, Comment, Post
+
+help = "Concurrent throughput of the async views served over WSGI and ASGI."
+on_disk = True
+
+EMOJIS = ["👍", "❤️", "😂"]
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--clients", type=int, default=32, help="Concurrent users."
+    )
+    parser.add_argument(
+        "--requests", type=int, default=30, help="Requests per user."
+    )
+    parser.add_argument(
+        "--posts", type=int, default=200, help="Posts on the timeline."
+    )
+
+
+def workload(post_ids, n):
+    """The ``n``-th request of a user: timeline, a post, or a reaction click."""
+    post_id = post_ids[n % len(post_ids)]
+    if n % 3 == 0:
+        return "get", "/home/", {}
+    if n % 3 == 1:
+        return "get", f"/post/{post_id}/", {}
+    return (
+        "post",
+        f"/react/{post_id}/",
+        {"data": {"reaction": EMOJIS[n % len(EMOJIS)]}, "content_type": "application/json"},
+    )
+
+
+def report(stdout, label, latencies, errors, elapsed):
+    stdout.write(
+        f"{label:<6} {len(latencies) / elapsed:>8.0f} req/s  "
+        f"p50 {percentile(latencies, 50) * 1000:>7.1f}  "
+        f"p95 {percentile(latencies, 95) * 1000:>7.1f}  "
+        f"p99 {percentile(latencies, 99) * 1000:>7.1f}  "
+        f"errors {errors}"
+    )
+
+
+def run_wsgi(accounts, post_ids, requests):
+    """One thread per user, as a threaded WSGI server would serve them."""
+
+    def user(account):
+        client = logged_in_client(account)
+        latencies, errors = [], 0
+        try:
+            for n in range(requests):
+                method, url, kwargs = workload(post_ids, n)
+                start = time.perf_counter()
+                response = getattr(client, method)(url, **kwargs)
+                latencies.append(time.perf_counter() - start)
+                errors += response.status_code != 200
+        finally:
+            connection.close()
+        return latencies, errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(accounts)) as pool:
+        results = list(pool.map(user, accounts))
+    return results, time.perf_counter() - start
+
+
+def run_asgi(accounts, post_ids, requests):
+    """One task per user on a single event loop, as an ASGI server would."""
+    # Sessions are created up front: the test client's session helper is sync.
+    clients = [logged_in_client(account, AsyncClient) for account in accounts]
+
+    async def user(client):
+        latencies, errors = [], 0
+        for n in range(requests):
+            method, url, kwargs = workload(post_ids, n)
+            start = time.perf_counter()
+            response = await getattr(client, method)(url, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code != 200
+        return latencies, errors
+
+    async def main():
+        return await asyncio.gather(*(user(client) for client in clients))
+
+    start = time.perf_counter()
+    results = asyncio.run(main())
+    return results, time.perf_counter() - start
+
+
+def run(stdout, clients, requests, posts, **options):
+    accounts = Account.objects.bulk_create(
+        Account(username=f"user{n}", email=f"user{n}@example.com")
+        for n in range(clients)
+    )
+    post_ids = [
+        post.pk
+        for post in Post.objects.bulk_create(
+            Post(author=accounts[n % clients], content=f"Post {n}")
+            for n in range(posts)
+        )
+    ]
+    Comment.objects.bulk_create(
+        Comment(post_id=post_id, author=accounts[0], content="Reply")
+        for post_id in post_ids
+        for _ in range(5)
+    )
+
+    # Failures are counted below; keep their tracebacks off the report.
+    logging.getLogger("django.request").setLevel(logging.CRITICAL)
+    stdout.write(f"{clients} users x {requests} requests (timeline, post, reaction)")
+    for label, runner in [("wsgi", run_wsgi), ("asgi", run_asgi)]:
+        results, elapsed = runner(accounts, post_ids, requests)
+        latencies = [sample for samples, _ in results for sample in samples]
+        errors = sum(errors for _, errors in results)
+        report(stdout, label, latencies, errors, elapsed)
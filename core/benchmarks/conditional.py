@@ -0,0 +1,93 @@
+import time
+
+from django.urls import reverse
+
+from core.benchmarks import logged_in_client, queries_of
+from core.counters import apply_comment_change
+from core.models import Account, Comment, Item, Post
+
+help = "Full renders against 304 revalidations, and gzip savings, per page."
+
+PASSWORD = "bench-password"
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--requests", type=int, default=50, help="Requests per page and mode."
+    )
+
+
+def timed(client, path, requests, **headers):
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(path, headers=headers)
+    return response, (time.perf_counter() - start) / requests
+
+
+def run(stdout, requests, **options):
+    account = Account(username="reader", email="reader@example.com")
+    account.set_password(PASSWORD)
+    account.save()
+    posts = Post.objects.bulk_create(
+        Post(author=account, content=f"Post {n} about the weekend release")
+        for n in range(40)
+    )
+    Comment.objects.bulk_create(
+        Comment(post=posts[0], author=account, content=f"Reply {n}") for n in range(5)
+    )
+    other = Account.objects.create(username="other", email="other@example.com")
+    other_post = Post.objects.create(author=other, content="Someone else's post")
+    item = Item.objects.create(
+        name="Mug", description="A mug for coffee", price=9, stock=100
+    )
+    Item.objects.bulk_create(
+        Item(name=f"Item {n}", description="Catalog filler", price=n + 1, stock=10)
+        for n in range(30)
+    )
+    client = logged_in_client(account)
+
+    # Counter changes each page does not show: the oldest post is off the
+    # timeline's first page, and the other account's post is off the profile.
+    unrelated = {
+        "post_list": lambda: apply_comment_change(posts[0].pk),
+        "get_profile": lambda: apply_comment_change(other_post.pk),
+    }
+    pages = {
+        "post_list": reverse("post_list"),
+        "get_profile": reverse("get_profile", args=[account.pk]),
+        "item_list": reverse("item_list"),
+        "item_detail": reverse("item_detail", args=[item.pk]),
+    }
+    stdout.write(
+        f"{'page':<12} {'full ms':>7} {'queries':>7} {'bytes':>7} {'gzip':>6} "
+        f"{'status':>6} {'reval ms':>8} {'queries':>7} {'unrelated':>9} "
+        f"{'after change':>12}"
+    )
+    for name, path in pages.items():
+        full, full_time = timed(client, path, requests)
+        compressed = client.get(path, headers={"Accept-Encoding": "gzip"})
+        etag = full["ETag"]
+        revalidated, revalidated_time = timed(
+            client, path, requests, If_None_Match=etag
+        )
+
+        unchanged = ""
+        if name in unrelated:
+            unrelated[name]()
+            unchanged = client.get(path, headers={"If-None-Match": etag}).status_code
+
+        # Any change to what the page shows must produce a full response.
+        if name in ("item_list", "item_detail"):
+            item.stock = 99
+            item.save(update_fields=["stock"])
+        else:
+            Post.objects.create(author=account, content="Breaking news")
+        changed = client.get(path, headers={"If-None-Match": etag})
+
+        stdout.write(
+            f"{name:<12} {full_time * 1000:>7.2f} {queries_of(full):>7} "
+            f"{len(full.content):>7} {len(compressed.content):>6} "
+            f"{revalidated.status_code:>6} {revalidated_time * 1000:>8.2f} "
+            f"{queries_of(revalidated):>7} {unchanged:>9} "
+            f"{changed.status_code:>12}"
+        )
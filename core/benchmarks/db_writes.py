@@ -0,0 +1,122 @@
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+from django.conf import settings
+from django.db import connection
+
+from core.counters import apply_comment_change
+from core.models import Account, Comment, Post
+from core.reactions import toggle_reaction
+
+help = "Concurrent reaction and comment write throughput of the database profile."
+on_disk = True
+
+# SQLite's out-of-the-box journaling, for comparison with the tuned profile:
+# (journal mode, init_command for every connection).  The profile's own
+# init_command would switch each new worker connection back to WAL.
+SQLITE_BASELINE = ("DELETE", "PRAGMA synchronous=FULL;")
+
+
+def add_arguments(parser):
+    parser.add_argument("--writers", type=int, default=8, help="Concurrent writers.")
+    parser.add_argument(
+        "--seconds", type=float, default=5.0, help="Duration of each run."
+    )
+    parser.add_argument(
+        "--posts", type=int, default=4, help="Posts the writes are spread over."
+    )
+
+
+def write_for(seconds, account, posts, barrier):
+    """Alternate reaction toggles and comments for ``seconds``."""
+    writes = errors = 0
+    journal_mode = None
+    try:
+        if connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute("PRAGMA journal_mode")
+                journal_mode = cursor.fetchone()[0]
+        barrier.wait()
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            post = posts[writes % len(posts)]
+            try:
+                if writes % 2:
+                    Comment.objects.create(post_id=post, author=account, content="x")
+                    apply_comment_change(post)
+                else:
+                    toggle_reaction(post, account.pk, "👍")
+                writes += 1
+            except Exception:
+                errors += 1
+    finally:
+        connection.close()
+    return writes, errors, journal_mode
+
+
+def run_mode(label, seconds, accounts, posts, stdout):
+    barrier = Barrier(len(accounts))
+    with ThreadPoolExecutor(max_workers=len(accounts)) as pool:
+        results = list(
+            pool.map(
+                lambda account: write_for(seconds, account, posts, barrier),
+                accounts,
+            )
+        )
+    writes = sum(result[0] for result in results)
+    errors = sum(result[1] for result in results)
+    # What the workers' connections actually ran with.
+    modes = ",".join(sorted({str(result[2]) for result in results}))
+    stdout.write(
+        f"{label:<22} {writes / seconds:>10.0f} writes/s {errors:>8} errors"
+        f"   journal={modes}"
+    )
+
+
+@contextmanager
+def sqlite_profile(journal_mode, init_command):
+    """Run with ``journal_mode`` and ``init_command`` on every new connection.
+
+    Worker threads build their connections from the same settings dict, so
+    swapping ``init_command`` there reaches them too.  Switching journal mode
+    needs the database to itself, so it is done once here, between runs.
+    """
+    options = connection.settings_dict["OPTIONS"]
+    saved = options.get("init_command")
+    options["init_command"] = init_command
+    connection.close()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+        connection.close()
+        yield
+    finally:
+        options["init_command"] = saved
+        connection.close()
+
+
+def run(stdout, writers, seconds, posts, **options):
+    accounts = Account.objects.bulk_create(
+        Account(username=f"writer{n}", email=f"writer{n}@example.com")
+        for n in range(writers)
+    )
+    post_ids = [
+        post.pk
+        for post in Post.objects.bulk_create(
+            Post(author=accounts[0], content=f"Post {n}") for n in range(posts)
+        )
+    ]
+
+    stdout.write(f"{'profile':<22} {'throughput':>19} {'':>8}")
+    if connection.vendor == "sqlite":
+        with sqlite_profile(*SQLITE_BASELINE):
+            run_mode("sqlite (default)", seconds, accounts, post_ids, stdout)
+        # The profile's own init_command sets WAL and synchronous=NORMAL.
+        with sqlite_profile(
+            "WAL", connection.settings_dict["OPTIONS"].get("init_command")
+        ):
+            run_mode("sqlite (profile)", seconds, accounts, post_ids, stdout)
+    else:
+        run_mode(settings.DB_PROFILE, seconds, accounts, post_ids, stdout)
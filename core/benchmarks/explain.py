@@ -0,0 +1,126 @@
+import re
+
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.models import Account, Comment, Item, MediaJob, Order, Post, Reaction
+from core.pagination import encode_cursor, keyset_queryset
+
+help = "Assert that every hot query in core.views is served by an index."
+
+# (label, table, queryset factory).  Each mirrors a query the views issue.
+HOT_QUERIES = [
+    (
+        "timeline page",
+        "core_post",
+        lambda ids: keyset_queryset(Post.objects.all())[:21],
+    ),
+    (
+        "timeline page after cursor",
+        "core_post",
+        lambda ids: keyset_queryset(Post.objects.all(), ids["cursor"])[:21],
+    ),
+    (
+        "profile posts",
+        "core_post",
+        lambda ids: keyset_queryset(Post.objects.filter(author_id=ids["account"]))[:21],
+    ),
+    (
+        "post replies page",
+        "core_comment",
+        lambda ids: keyset_queryset(
+            Comment.objects.filter(post_id=ids["post"], is_active=True),
+            ids["cursor"],
+        )[:21],
+    ),
+    (
+        "viewer's reaction",
+        "core_reaction",
+        lambda ids: Reaction.objects.filter(
+            post_id=ids["post"], user_id=ids["account"]
+        ).values_list("reaction_type", flat=True)[:1],
+    ),
+    (
+        "reaction breakdown rebuild",
+        "core_reaction",
+        lambda ids: Reaction.objects.filter(post_id__in=[ids["post"]]).values(
+            "post_id", "reaction_type"
+        ),
+    ),
+    (
+        "login lookup",
+        "core_account",
+        lambda ids: Account.objects.filter(username="bench"),
+    ),
+    (
+        "order list",
+        "core_order",
+        lambda ids: Order.objects.filter(user_id=ids["account"]).order_by("-created_at"),
+    ),
+    (
+        "item detail",
+        "core_item",
+        lambda ids: Item.objects.filter(pk=ids["item"]),
+    ),
+    (
+        "pending media jobs",
+        "core_mediajob",
+        lambda ids: MediaJob.objects.filter(status=MediaJob.PENDING).order_by(
+            "created_at"
+        ),
+    ),
+]
+
+
+# Keyset pages past a cursor must seek into the index, not walk it from the top.
+MUST_SEEK = {"timeline page after cursor", "post replies page"}
+
+
+def add_arguments(parser):
+    pass
+
+
+def uses_index(plan, table, seek=False):
+    """Whether ``plan`` reads ``table`` only through an index, without sorting.
+
+    With ``seek`` the index must also be entered at a key (a range or equality
+    search) rather than scanned from one end.
+    """
+    if connection.vendor == "postgresql":
+        ok = "Seq Scan" not in plan and "Sort" not in plan
+        return ok and (not seek or "Index Cond" in plan)
+    full_scan = re.compile(rf"\bSCAN {table}\b(?! USING)")
+    ok = not full_scan.search(plan) and "TEMP B-TREE" not in plan
+    return ok and (not seek or f"SEARCH {table}" in plan)
+
+
+def run(stdout, **options):
+    account = Account.objects.create(username="bench", email="bench@example.com")
+    post = Post.objects.create(author=account, content="bench")
+    item = Item.objects.create(name="bench", price="1.00")
+    ids = {
+        "account": account.pk,
+        "post": post.pk,
+        "item": item.pk,
+        "cursor": encode_cursor(timezone.now(), 1),
+    }
+
+    failures = []
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            # Tiny tables make sequential scans cheapest; rule them out so the
+            # plan shows whether an index *can* serve the query.
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        for label, table, build in HOT_QUERIES:
+            plan = build(ids).explain()
+            ok = uses_index(plan, table, seek=label in MUST_SEEK)
+            if not ok:
+                failures.append(label)
+            stdout.write(f"{'ok  ' if ok else 'FAIL'} {label}")
+            for line in plan.splitlines():
+                stdout.write(f"       {line}")
+
+    if failures:
+        raise CommandError(f"Queries not served by an index: {', '.join(failures)}")
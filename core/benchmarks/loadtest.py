@@ -0,0 +1,152 @@
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.urls import reverse
+
+from core.benchmarks import logged_in_client, percentile, queries_of
+from core.models import Account, Item, Order, Post
+from core.pagination import encode_cursor
+from core.seeding import seed_data
+
+help = "Seed synthetic data, then drive the main views and report latency and queries."
+on_disk = True
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Multiplier on the seeded volume (1.0 = 500 accounts, 5000 posts).",
+    )
+    parser.add_argument("--clients", type=int, default=4, help="Concurrent users.")
+    parser.add_argument(
+        "--rounds", type=int, default=20, help="Passes over the views per user."
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed.")
+
+
+def scenarios(rng, targets):
+    """``(url name, method, path, client kwargs)`` for one request per view."""
+    post = rng.choice(targets["posts"])
+    account = rng.choice(targets["accounts"])
+    return [
+        ("post_list", "get", reverse("post_list"), {}),
+        (
+            "post_list_more",
+            "get",
+            reverse("post_list_more"),
+            {"data": {"cursor": targets["cursor"]}},
+        ),
+        ("post_detail", "get", reverse("post_detail", args=[post]), {}),
+        ("post_comments", "get", reverse("post_comments", args=[post]), {}),
+        ("get_profile", "get", reverse("get_profile", args=[account]), {}),
+        ("profile_posts", "get", reverse("profile_posts", args=[account]), {}),
+        ("item_list", "get", reverse("item_list"), {}),
+        (
+            "item_detail",
+            "get",
+            reverse("item_detail", args=[rng.choice(targets["items"])]),
+            {},
+        ),
+        ("order_list", "get", reverse("order_list"), {}),
+        (
+            "order_detail",
+            "get",
+            reverse("order_detail", args=[rng.choice(targets["orders"])]),
+            {},
+        ),
+        (
+            "react_to_post",
+            "post",
+            reverse("react_to_post", args=[post]),
+            {
+                "data": {"reaction": rng.choice(["👍", "❤️", "😂"])},
+                "content_type": "application/json",
+            },
+        ),
+        (
+            "comment_create",
+            "post",
+            reverse("comment_create", args=[post]),
+            {"data": {"content": "Load test reply"}},
+        ),
+    ]
+
+
+def run(stdout, scale, clients, rounds, seed, **options):
+    start = time.perf_counter()
+    counts = seed_data(
+        accounts=int(500 * scale),
+        posts=int(5000 * scale),
+        items=int(100 * scale),
+        orders=int(1000 * scale),
+        seed=seed,
+    )
+    stdout.write(
+        f"seeded {sum(counts.values())} rows in {time.perf_counter() - start:.1f}s: "
+        + ", ".join(f"{count} {name}" for name, count in counts.items())
+    )
+
+    oldest_on_first_page = Post.objects.order_by("-created_at", "-id")[19]
+    targets = {
+        "posts": list(Post.objects.values_list("pk", flat=True)),
+        "accounts": list(Account.objects.values_list("pk", flat=True)),
+        "items": list(Item.objects.values_list("pk", flat=True)),
+        "orders": list(Order.objects.values_list("pk", flat=True)),
+        "cursor": encode_cursor(oldest_on_first_page.created_at, oldest_on_first_page.pk),
+    }
+    users = Account.objects.filter(orders__isnull=False).distinct()[:clients]
+
+    def user(account):
+        rng = random.Random(f"{seed}-{account.pk}")
+        client = logged_in_client(account)
+        samples = []
+        try:
+            for _ in range(rounds):
+                for name, method, path, kwargs in scenarios(rng, targets):
+                    began = time.perf_counter()
+                    response = getattr(client, method)(path, **kwargs)
+                    samples.append(
+                        (
+                            name,
+                            time.perf_counter() - began,
+                            queries_of(response),
+                            response.status_code >= 400,
+                        )
+                    )
+        finally:
+            connection.close()
+        return samples
+
+    # Failures are counted per view below; keep their tracebacks off the report.
+    logging.getLogger("django.request").setLevel(logging.CRITICAL)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = [sample for samples in pool.map(user, users) for sample in samples]
+    elapsed = time.perf_counter() - start
+
+    stdout.write(
+        f"{len(results)} requests from {clients} users in {elapsed:.1f}s "
+        f"({len(results) / elapsed:.0f} req/s)"
+    )
+    stdout.write(
+        f"{'view':<16} {'reqs':>5} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} "
+        f"{'queries':>7} {'errors':>6}"
+    )
+    by_view = {}
+    for name, latency, queries, failed in results:
+        by_view.setdefault(name, []).append((latency, queries, failed))
+    for name, samples in by_view.items():
+        latencies = [latency for latency, _, _ in samples]
+        stdout.write(
+            f"{name:<16} {len(samples):>5} "
+            f"{percentile(latencies, 50) * 1000:>7.1f} "
+            f"{percentile(latencies, 95) * 1000:>7.1f} "
+            f"{percentile(latencies, 99) * 1000:>7.1f} "
+            f"{sum(queries for _, queries, _ in samples) / len(samples):>7.1f} "
+            f"{sum(failed for _, _, failed in samples):>6}"
+        )
@@ -0,0 +1,93 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, make_password
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from core.models import Account
+
+help = "Logins/sec at the configured password cost, and the cost of throttled bursts."
+on_disk = True
+
+PASSWORD = "correct horse battery staple"
+
+
+def add_arguments(parser):
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent logins.")
+    parser.add_argument("--logins", type=int, default=5, help="Logins per client.")
+    parser.add_argument(
+        "--burst", type=int, default=100, help="Bad attempts in the throttling burst."
+    )
+
+
+def login_rate(accounts, logins):
+    def login(account):
+        client = Client()
+        ok = 0
+        try:
+            for _ in range(logins):
+                response = client.post(
+                    "/login/", {"username": account.username, "password": PASSWORD}
+                )
+                ok += response.status_code == 302
+        finally:
+            connection.close()
+        return ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(accounts)) as pool:
+        ok = sum(pool.map(login, accounts))
+    return ok, time.perf_counter() - start
+
+
+def run(stdout, clients, logins, burst, **options):
+    chosen = settings.PASSWORD_HASH_ITERATIONS
+    stdout.write(f"{'iterations':>10} {'hash ms':>8} {'logins/s':>9}")
+    for iterations in sorted({chosen, PBKDF2PasswordHasher.iterations}):
+        with override_settings(PASSWORD_HASH_ITERATIONS=iterations):
+            start = time.perf_counter()
+            encoded = make_password(PASSWORD)
+            hash_time = time.perf_counter() - start
+
+            Account.objects.all().delete()
+            accounts = Account.objects.bulk_create(
+                Account(username=f"user{n}", email=f"user{n}@example.com", password=encoded)
+                for n in range(clients)
+            )
+            ok, elapsed = login_rate(accounts, logins)
+        marker = "  <- PASSWORD_HASH_ITERATIONS" if iterations == chosen else ""
+        stdout.write(
+            f"{iterations:>10} {hash_time * 1000:>8.0f} {ok / elapsed:>9.1f}{marker}"
+        )
+
+    # Rows from before hashing hold plain text and are upgraded on login.
+    legacy = Account.objects.create(
+        username="legacy", email="legacy@example.com", password=PASSWORD
+    )
+    Client().post("/login/", {"username": "legacy", "password": PASSWORD})
+    legacy.refresh_from_db()
+    stdout.write(
+        f"plaintext row hashed on login: {legacy.password.startswith('pbkdf2_sha256$')}"
+    )
+
+    # Credential stuffing against one account from one address.  Refusals are
+    # counted below; keep their log lines off the report.
+    logging.getLogger("django.request").setLevel(logging.ERROR)
+    caches[settings.LOGIN_THROTTLE_CACHE_ALIAS].clear()
+    client = Client()
+    statuses = {}
+    with CaptureQueriesContext(connection) as queries:
+        for n in range(burst):
+            response = client.post(
+                "/login/", {"username": "user0", "password": f"guess{n}"}
+            )
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    stdout.write(
+        f"burst of {burst} bad logins: statuses {statuses}, "
+        f"{len(queries)} queries in total"
+    )
@@ -0,0 +1,90 @@
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from django.test import Client, RequestFactory
+from django.test.utils import override_settings
+from django.views.static import serve
+
+from core.http import serve_media
+
+help = "Bytes and time for video playback, seeking and revalidation per media view."
+
+MB = 1024 * 1024
+
+
+def add_arguments(parser):
+    parser.add_argument("--size", type=int, default=64, help="Video size in MB.")
+    parser.add_argument("--seeks", type=int, default=50, help="Seeks to time.")
+
+
+def body_length(response):
+    return sum(len(chunk) for chunk in response) if response.streaming else len(
+        response.content
+    )
+
+
+def run(stdout, size, seeks, **options):
+    media_root = tempfile.mkdtemp()
+    try:
+        path = "posts/videos/bench.mp4"
+        os.makedirs(os.path.join(media_root, os.path.dirname(path)))
+        with open(os.path.join(media_root, path), "wb") as file:
+            for _ in range(size):
+                file.write(os.urandom(MB))
+
+        rng = random.Random(1)
+        factory = RequestFactory()
+        views = {
+            "static.serve": lambda request: serve(request, path, document_root=media_root),
+            "serve_media": lambda request: serve_media(request, path),
+        }
+        stdout.write(
+            f"{'view':<14} {'scenario':<12} {'status':>6} {'MB/request':>10} {'ms/request':>10}"
+        )
+        with override_settings(MEDIA_ROOT=media_root, MEDIA_SERVE_MODE="django"):
+            for name, view in views.items():
+                first = view(factory.get("/"))
+                etag, modified = first.get("ETag"), first["Last-Modified"]
+                body_length(first)
+                scenarios = {
+                    "full": lambda: factory.get("/"),
+                    # <video> seeking: a 1 MB window somewhere in the file.
+                    "seek": lambda: factory.get(
+                        "/",
+                        headers={
+                            "Range": "bytes=%d-%d"
+                            % ((start := rng.randrange(size * MB - MB)), start + MB - 1)
+                        },
+                    ),
+                    "revalidate": lambda: factory.get(
+                        "/",
+                        headers={"If-None-Match": etag}
+                        if etag
+                        else {"If-Modified-Since": modified},
+                    ),
+                }
+                for scenario, make_request in scenarios.items():
+                    count = 3 if scenario == "full" else seeks
+                    start = time.perf_counter()
+                    total = 0
+                    for _ in range(count):
+                        response = view(make_request())
+                        total += body_length(response)
+                        response.close()
+                    elapsed = time.perf_counter() - start
+                    stdout.write(
+                        f"{name:<14} {scenario:<12} {response.status_code:>6} "
+                        f"{total / count / MB:>10.2f} {elapsed / count * 1000:>10.1f}"
+                    )
+
+            # Offload modes send headers only; the proxy moves the bytes.
+            for mode in ("x-accel-redirect", "x-sendfile"):
+                with override_settings(MEDIA_SERVE_MODE=mode):
+                    response = Client().get(f"/media/{path}")
+                    header = "X-Accel-Redirect" if mode == "x-accel-redirect" else "X-Sendfile"
+                    stdout.write(f"{mode}: {header}: {response[header]}")
+    finally:
+        shutil.rmtree(media_root)
@@ -0,0 +1,49 @@
+import time
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.benchmarks import logged_in_client
+from core.models import Account, Item
+
+help = "Queries and latency of order_create as the cart grows."
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1, 5, 10, 25, 50, 100],
+        help="Cart sizes (number of distinct items) to submit.",
+    )
+
+
+def run(stdout, sizes, **options):
+    account = Account.objects.create(username="bench", email="bench@example.com")
+    items = Item.objects.bulk_create(
+        Item(name=f"Item {n}", price="9.99", stock=1_000_000)
+        for n in range(max(sizes))
+    )
+    client = logged_in_client(account)
+    client.get("/orders/")  # warm the session account cache
+
+    stdout.write(f"{'cart size':>10} {'queries':>8} {'ms':>8}")
+    query_counts = set()
+    for size in sizes:
+        data = {
+            "item_ids": [item.pk for item in items[:size]],
+            "quantities": [2] * size,
+        }
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = client.post(f"/order/create/{items[0].pk}/", data)
+            elapsed = (time.perf_counter() - start) * 1000
+        assert response.status_code == 302, response.status_code
+        query_counts.add(len(queries))
+        stdout.write(f"{size:>10} {len(queries):>8} {elapsed:>8.1f}")
+
+    if len(query_counts) == 1:
+        stdout.write("Query count is constant across cart sizes.")
+    else:
+        stdout.write(f"Query count varies with cart size: {sorted(query_counts)}")
@@ -0,0 +1,93 @@
+import gzip
+import os
+import shutil
+import tempfile
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from core.benchmarks import logged_in_client
+from core.http import hashed_names, serve_static
+from core.models import Account, Comment, Post
+
+help = "HTML bytes per page, and the compressed static assets collectstatic builds."
+
+
+def add_arguments(parser):
+    parser.add_argument("--posts", type=int, default=20, help="Posts on the timeline.")
+
+
+def inline_bytes(html, tag):
+    """Bytes inside ``<tag>...</tag>`` blocks, i.e. not cacheable separately."""
+    total, start = 0, 0
+    while (start := html.find(f"<{tag}>", start)) != -1:
+        end = html.find(f"</{tag}>", start)
+        total += end - start
+        start = end
+    return total
+
+
+def run(stdout, posts, **options):
+    static_root = tempfile.mkdtemp()
+    try:
+        with override_settings(STATIC_ROOT=static_root, DEBUG=False):
+            call_command("collectstatic", interactive=False, verbosity=0)
+            hashed_names.cache_clear()
+
+            stdout.write(f"{'asset':<36} {'bytes':>7} {'gzip':>7} {'brotli':>7}")
+            for name, hashed in sorted(staticfiles_storage.hashed_files.items()):
+                if name.startswith("admin/"):
+                    continue
+                path = os.path.join(static_root, hashed)
+                sizes = [
+                    os.path.getsize(path + suffix)
+                    if os.path.exists(path + suffix)
+                    else "-"
+                    for suffix in ("", ".gz", ".br")
+                ]
+                stdout.write(f"{hashed:<36} {sizes[0]:>7} {sizes[1]:>7} {sizes[2]:>7}")
+
+            asset = staticfiles_storage.hashed_files["css/base.css"]
+            response = serve_static(
+                RequestFactory().get("/", headers={"Accept-Encoding": "gzip, br"}), asset
+            )
+            stdout.write(
+                f"\nGET {asset}: {response.status_code}, "
+                f"Content-Encoding: {response.get('Content-Encoding')}, "
+                f"Cache-Control: {response['Cache-Control']}"
+            )
+            response.close()
+
+            account = Account(username="reader", email="reader@example.com")
+            account.set_password("bench-password")
+            account.save()
+            created = Post.objects.bulk_create(
+                Post(author=account, content=f"Post {n} with a little text")
+                for n in range(posts)
+            )
+            Comment.objects.bulk_create(
+                Comment(post=created[-1], author=account, content=f"Reply {n}")
+                for n in range(20)
+            )
+            client = logged_in_client(account)
+            stdout.write(
+                f"\n{'page':<14} {'HTML bytes':>10} {'gzip':>7} {'inline css':>10} "
+                f"{'inline js':>9}"
+            )
+            for name, url in [
+                ("post_list", "/home/"),
+                ("post_detail", f"/post/{created[-1].pk}/"),
+                ("get_profile", f"/profile/{account.pk}/"),
+            ]:
+                html = b"".join(client.get(url))
+                text = html.decode()
+                assert staticfiles_storage.hashed_files["css/base.css"] in text
+                stdout.write(
+                    f"{name:<14} {len(html):>10} {len(gzip.compress(html)):>7} "
+                    f"{inline_bytes(text, 'style'):>10} {inline_bytes(text, 'script'):>9}"
+                )
+    finally:
+        hashed_names.cache_clear()
+        shutil.rmtree(static_root)
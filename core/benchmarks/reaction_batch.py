@@ -0,0 +1,73 @@
+import random
+import time
+
+from django.urls import reverse
+
+from core.benchmarks import logged_in_client, queries_of
+from core.caching import bump_post_version
+from core.counters import rebuild_post_counters
+from core.models import Account, Post, Reaction
+
+help = "Hydrating reaction state for a page of posts: one request per post vs one batch."
+
+REACTIONS = ["👍", "❤️", "😂", "🔥"]
+
+
+def add_arguments(parser):
+    parser.add_argument("--posts", type=int, default=50, help="Posts per page.")
+    parser.add_argument("--rounds", type=int, default=20, help="Pages hydrated per mode.")
+
+
+def run(stdout, posts, rounds, **options):
+    rng = random.Random(1)
+    accounts = Account.objects.bulk_create(
+        Account(username=f"user{n}", email=f"user{n}@example.com") for n in range(50)
+    )
+    created = Post.objects.bulk_create(
+        Post(author=rng.choice(accounts), content=f"Post {n}") for n in range(posts)
+    )
+    Reaction.objects.bulk_create(
+        Reaction(post=post, user=user, reaction_type=rng.choice(REACTIONS))
+        for post in created
+        for user in rng.sample(accounts, rng.randint(0, 20))
+    )
+    rebuild_post_counters([post.pk for post in created])
+
+    client = logged_in_client(accounts[0])
+    url = reverse("post_reactions")
+    ids = [str(post.pk) for post in created]
+
+    stdout.write(f"{'mode':<22} {'requests':>8} {'queries':>7} {'ms/page':>8}")
+    for mode, warm in [
+        ("per post, cold cache", False),
+        ("per post, warm cache", True),
+        ("batch, cold cache", False),
+        ("batch, warm cache", True),
+    ]:
+        batches = [ids] if mode.startswith("batch") else [[pk] for pk in ids]
+        queries = requests = 0
+        elapsed = 0.0
+        for _ in range(rounds):
+            if not warm:
+                # As if every post had changed since the last page view.
+                for post in created:
+                    bump_post_version(post.pk)
+            start = time.perf_counter()
+            for batch in batches:
+                response = client.get(url, {"ids": ",".join(batch)})
+                queries += queries_of(response)
+                requests += 1
+            elapsed += time.perf_counter() - start
+        stdout.write(
+            f"{mode:<22} {requests / rounds:>8.0f} {queries / rounds:>7.0f} "
+            f"{elapsed / rounds * 1000:>8.1f}"
+        )
+
+    response = client.get(url, {"ids": ",".join(ids)})
+    revalidated = client.get(
+        url, {"ids": ",".join(ids)}, headers={"If-None-Match": response["ETag"]}
+    )
+    stdout.write(
+        f"revalidating the batch: {revalidated.status_code}, "
+        f"{queries_of(revalidated)} queries"
+    )
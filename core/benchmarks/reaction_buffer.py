@@ -0,0 +1,136 @@
+import logging
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from core.benchmarks import logged_in_client, percentile
+from core.counters import rebuild_post_counters
+from core.models import Account, Post, Reaction
+from core.reaction_buffer import reaction_buffer, recover_journals
+
+help = "Hot-post reaction clicks written through vs. write-behind, and crash recovery."
+on_disk = True
+
+EMOJIS = ["👍", "👍", "❤️", "😂"]
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--clients", type=int, default=16, help="Concurrent users clicking."
+    )
+    parser.add_argument("--clicks", type=int, default=50, help="Clicks per user.")
+
+
+def click_all(post, users, clicks):
+    """Have every user click ``clicks`` times; returns (elapsed, latencies, final).
+
+    ``final`` maps each user to the reaction the last response reported, i.e.
+    what the database must hold once everything is written.
+    """
+    url = f"/react/{post.pk}/"
+    barrier = Barrier(len(users))
+
+    def click(user):
+        client = logged_in_client(user)
+        latencies, current = [], None
+        barrier.wait()
+        try:
+            for n in range(clicks):
+                start = time.perf_counter()
+                response = client.post(
+                    url,
+                    {"reaction": EMOJIS[(n + user.pk) % len(EMOJIS)]},
+                    content_type="application/json",
+                )
+                latencies.append(time.perf_counter() - start)
+                if response.status_code == 200:
+                    current = response.json()["user_reaction"]
+        finally:
+            connection.close()
+        return user.pk, latencies, current
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(users)) as pool:
+        results = list(pool.map(click, users))
+    elapsed = time.perf_counter() - start
+    latencies = [sample for _, samples, _ in results for sample in samples]
+    return elapsed, latencies, {user_id: current for user_id, _, current in results}
+
+
+def missing(post, final):
+    """Users whose stored reaction differs from what they were last told."""
+    stored = dict(
+        Reaction.objects.filter(post=post).values_list("user_id", "reaction_type")
+    )
+    return sum(stored.get(user_id) != current for user_id, current in final.items())
+
+
+def counters_consistent(post):
+    post.refresh_from_db()
+    maintained = (post.reaction_count, dict(post.reaction_breakdown))
+    rebuild_post_counters([post.pk])
+    post.refresh_from_db()
+    return maintained == (post.reaction_count, dict(post.reaction_breakdown))
+
+
+def check(label, post, final, failures):
+    """Report ``label``'s lost reactions and counter drift, noting failures."""
+    lost = missing(post, final)
+    consistent = counters_consistent(post)
+    if lost:
+        failures.append(f"{label}: {lost} reactions missing")
+    if not consistent:
+        failures.append(f"{label}: counters drifted")
+    return f"missing {lost}  counters {'consistent' if consistent else 'DRIFTED'}"
+
+
+def run(stdout, clients, clicks, **options):
+    author = Account.objects.create(username="author", email="author@example.com")
+    post = Post.objects.create(author=author, content="Hot post")
+    users = Account.objects.bulk_create(
+        Account(username=f"user{n}", email=f"user{n}@example.com")
+        for n in range(clients)
+    )
+    # Failures show up as missing reactions below; keep tracebacks off the report.
+    logging.getLogger("django.request").setLevel(logging.CRITICAL)
+
+    failures = []
+    stdout.write(f"{clients} users x {clicks} clicks on one post")
+    for mode in ["sync", "buffered"]:
+        with override_settings(REACTION_WRITE_MODE=mode):
+            elapsed, latencies, final = click_all(post, users, clicks)
+            reaction_buffer.stop()
+        stdout.write(
+            f"{mode:<9} {len(latencies) / elapsed:>7.0f} clicks/s  "
+            f"p50 {percentile(latencies, 50) * 1000:>6.1f}  "
+            f"p95 {percentile(latencies, 95) * 1000:>6.1f} ms  "
+            f"{check(mode, post, final, failures)}"
+        )
+
+    # Crash with everything still buffered, then recover from the journal.
+    with tempfile.TemporaryDirectory() as journal, override_settings(
+        REACTION_WRITE_MODE="buffered",
+        REACTION_JOURNAL_DIR=journal,
+        REACTION_FLUSH_INTERVAL=3600,
+        REACTION_FLUSH_MAX_PENDING=10**9,
+    ):
+        # One click more than before, so every user ends on a different reaction.
+        _, _, final = click_all(post, users, clicks + 1)
+        reaction_buffer.stop(flush=False)
+        unflushed = missing(post, final)
+        replayed = recover_journals(journal)
+    if not unflushed:
+        # Nothing was left in the buffer, so recovery went untested.
+        failures.append("crash: every reaction was flushed before the crash")
+    stdout.write(
+        f"crash     {unflushed} users' reactions unflushed, "
+        f"{replayed} changes replayed, {check('crash', post, final, failures)}"
+    )
+
+    if failures:
+        raise CommandError(f"Reactions lost or miscounted: {'; '.join(failures)}")
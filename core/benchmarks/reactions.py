@@ -0,0 +1,94 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+from django.db import IntegrityError, connection
+
+from core.benchmarks import logged_in_client, percentile
+from core.counters import rebuild_post_counters
+from core.models import Account, Post, Reaction
+
+help = "Concurrent react_to_post clicks on a single hot post."
+on_disk = True
+
+EMOJIS = ["👍", "👍", "❤️", "😂"]
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--clients", type=int, default=16, help="Concurrent users clicking."
+    )
+    parser.add_argument(
+        "--clicks", type=int, default=50, help="Clicks per user."
+    )
+
+
+def run(stdout, clients, clicks, **options):
+    author = Account.objects.create(username="author", email="author@example.com")
+    post = Post.objects.create(author=author, content="Hot post")
+    users = Account.objects.bulk_create(
+        Account(username=f"user{n}", email=f"user{n}@example.com")
+        for n in range(clients)
+    )
+    url = f"/react/{post.pk}/"
+    barrier = Barrier(clients)
+
+    def click(user):
+        client = logged_in_client(user)
+        latencies, errors = [], {}
+        barrier.wait()
+        try:
+            for n in range(clicks):
+                start = time.perf_counter()
+                try:
+                    response = client.post(
+                        url,
+                        {"reaction": EMOJIS[n % len(EMOJIS)]},
+                        content_type="application/json",
+                    )
+                    if response.status_code != 200:
+                        errors[response.status_code] = errors.get(response.status_code, 0) + 1
+                except IntegrityError:
+                    errors["IntegrityError"] = errors.get("IntegrityError", 0) + 1
+                except Exception as exc:
+                    name = type(exc).__name__
+                    errors[name] = errors.get(name, 0) + 1
+                latencies.append(time.perf_counter() - start)
+        finally:
+            connection.close()
+        return latencies, errors
+
+    # Failures are tallied below; keep their tracebacks off the report.
+    logging.getLogger("django.request").setLevel(logging.CRITICAL)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(click, users))
+    elapsed = time.perf_counter() - start
+
+    latencies = [sample for samples, _ in results for sample in samples]
+    errors = {}
+    for _, worker_errors in results:
+        for name, count in worker_errors.items():
+            errors[name] = errors.get(name, 0) + count
+
+    post.refresh_from_db()
+    maintained = (post.reaction_count, dict(post.reaction_breakdown))
+    rebuild_post_counters([post.pk])
+    post.refresh_from_db()
+    recounted = (post.reaction_count, dict(post.reaction_breakdown))
+
+    stdout.write(f"clicks:         {len(latencies)} from {clients} clients")
+    stdout.write(f"throughput:     {len(latencies) / elapsed:.0f} clicks/s")
+    stdout.write(
+        "latency ms:     "
+        f"p50 {percentile(latencies, 50) * 1000:.1f}  "
+        f"p95 {percentile(latencies, 95) * 1000:.1f}  "
+        f"p99 {percentile(latencies, 99) * 1000:.1f}"
+    )
+    stdout.write(f"errors:         {errors or 'none'}")
+    stdout.write(f"reaction rows:  {Reaction.objects.filter(post=post).count()}")
+    stdout.write(
+        f"counters:       {'consistent' if maintained == recounted else 'DRIFTED'} "
+        f"{maintained}"
+    )
@@ -0,0 +1,88 @@
+import random
+import time
+
+from django.db.models import F, Q, Value
+from django.db.models.functions import Concat
+
+from core.benchmarks import percentile
+from core.models import Post
+from core.search import full_text_search
+from core.seeding import WORDS, seed_data
+
+help = "Full-text search latency against an icontains scan over seeded posts."
+
+TAGS = 100
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--posts", type=int, default=100_000, help="Posts to seed (try 1000000)."
+    )
+    parser.add_argument(
+        "--queries", type=int, default=50, help="Random queries per method."
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed.")
+
+
+def scan(query):
+    # What a plain ORM search would do: every word somewhere in the content.
+    condition = Q()
+    for word in query.split():
+        condition &= Q(content__icontains=word)
+    return list(Post.objects.filter(condition).order_by("-id")[:20])
+
+
+def run(stdout, posts, queries, seed, **options):
+    start = time.perf_counter()
+    counts = seed_data(
+        accounts=1000,
+        posts=posts,
+        comments=1,
+        reactions=0,
+        items=1000,
+        orders=0,
+        seed=seed,
+    )
+    stdout.write(
+        f"seeded {counts['posts']} posts, {counts['comments']} comments and "
+        f"{counts['items']} items in {time.perf_counter() - start:.1f}s"
+    )
+
+    # The seeded vocabulary is tiny, so every word is in most posts.  Tag a few
+    # posts with rare words too, like names and hashtags in real content.
+    rng = random.Random(seed)
+    post_ids = list(Post.objects.values_list("pk", flat=True))
+    for n in range(TAGS):
+        Post.objects.filter(pk__in=rng.sample(post_ids, max(1, posts // 2000))).update(
+            content=Concat(F("content"), Value(f" tag{n}"))
+        )
+
+    words = [word for word in WORDS if len(word) > 3]
+    common = [" ".join(rng.sample(words, rng.randint(1, 3))) for _ in range(queries)]
+    # The last word typed is often incomplete.
+    common = [query[: rng.randint(len(query) - 2, len(query))] for query in common]
+    workloads = {
+        "common": common,
+        "rare": [f"tag{rng.randrange(TAGS)}" for _ in range(queries)],
+        "missing": [f"nothing{n}" for n in range(queries)],
+    }
+
+    stdout.write(
+        f"{'queries':<8} {'method':<10} {'p50 ms':>8} {'p95 ms':>8} {'hits/query':>10}"
+    )
+    for workload, samples in workloads.items():
+        for name, method in [
+            ("full-text", lambda query: full_text_search(query, "post")[0]),
+            ("icontains", scan),
+        ]:
+            method(samples[0])  # warm up
+            latencies, hits = [], 0
+            for query in samples:
+                began = time.perf_counter()
+                hits += len(method(query))
+                latencies.append(time.perf_counter() - began)
+            stdout.write(
+                f"{workload:<8} {name:<10} {percentile(latencies, 50) * 1000:>8.1f} "
+                f"{percentile(latencies, 95) * 1000:>8.1f} "
+                f"{hits / len(samples):>10.1f}"
+            )
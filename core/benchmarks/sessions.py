@@ -0,0 +1,74 @@
+import time
+from contextlib import ExitStack, contextmanager
+from importlib import import_module
+from unittest import mock
+
+from django.conf import settings
+from django.test.utils import override_settings
+
+from core.benchmarks import logged_in_client, queries_of
+from core.models import Account, Post
+
+help = "Queries and time per post_list request under each session backend."
+
+BACKENDS = ["db", "cached_db", "cache", "signed_cookies"]
+PASSWORD = "bench-password"
+
+
+@contextmanager
+def session_writes():
+    """Count the current backend's session writes (saves and deletes).
+
+    Counted on the ``SessionStore`` rather than in SQL, so the cache and
+    signed_cookies backends, which never touch the database, are measured too.
+    """
+    store = import_module(settings.SESSION_ENGINE).SessionStore
+    with ExitStack() as stack:
+        calls = [
+            stack.enter_context(
+                mock.patch.object(
+                    store, name, autospec=True, side_effect=getattr(store, name)
+                )
+            )
+            for name in ("save", "delete")
+        ]
+        yield calls
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--requests", type=int, default=50, help="Timeline requests per backend."
+    )
+
+
+def run(stdout, requests, **options):
+    account = Account(username="reader", email="reader@example.com")
+    account.set_password(PASSWORD)
+    account.save()
+    Post.objects.bulk_create(
+        Post(author=account, content=f"Post {n}") for n in range(40)
+    )
+
+    stdout.write(
+        f"{'backend':<15} {'queries/req':>11} {'ms/req':>7} {'re-login writes':>15}"
+    )
+    for backend in BACKENDS:
+        with override_settings(
+            SESSION_ENGINE=f"django.contrib.sessions.backends.{backend}"
+        ):
+            client = logged_in_client(account)
+            client.get("/home/")  # warm the session and account caches
+
+            start = time.perf_counter()
+            total = sum(queries_of(client.get("/home/")) for _ in range(requests))
+            elapsed = time.perf_counter() - start
+
+            # Logging in again as the same user must not rewrite the session.
+            client.post("/login/", {"username": "reader", "password": PASSWORD})
+            with session_writes() as calls:
+                client.post("/login/", {"username": "reader", "password": PASSWORD})
+            writes = sum(call.call_count for call in calls)
+        stdout.write(
+            f"{backend:<15} {total / requests:>11.1f} "
+            f"{elapsed / requests * 1000:>7.1f} {writes:>15}"
+        )
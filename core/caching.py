@@ -0,0 +1,275 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+
+from .models import Account, Item, Post
+from .pagination import keyset_queryset
+
+
+def account_cache_key(account_id):
+    return f"account:{account_id}"
+
+
+def get_cached_account(account_id):
+    """Return the Account for ``account_id`` (or None), cached across requests."""
+    key = account_cache_key(account_id)
+    account = cache.get(key)
+    if account is None:
+        account = Account.objects.filter(pk=account_id).first()
+        if account is not None:
+            cache.set(key, account, getattr(settings, "ACCOUNT_CACHE_TIMEOUT", 300))
+    return account
+
+
+async def aget_cached_account(account_id):
+    """Async counterpart of ``get_cached_account``, sharing its cache entries."""
+    key = account_cache_key(account_id)
+    account = await cache.aget(key)
+    if account is None:
+        account = await Account.objects.filter(pk=account_id).afirst()
+        if account is not None:
+            await cache.aset(
+                key, account, getattr(settings, "ACCOUNT_CACHE_TIMEOUT", 300)
+            )
+    return account
+
+
+def account_version_key(account_id):
+    return f"account:{account_id}:version"
+
+
+def invalidate_account(account_id):
+    cache.delete(account_cache_key(account_id))
+    cache.set(account_version_key(account_id), time.time_ns(), None)
+
+
+def get_account_version(account_id):
+    """Return a stamp that changes whenever the account's row does."""
+    return _stamp(cache, account_version_key(account_id))
+
+
+def author_posts_version_key(author_id):
+    return f"account:{author_id}:posts:version"
+
+
+def get_author_posts_version(author_id):
+    """Return a stamp that changes whenever any of the author's posts does."""
+    return _stamp(cache, author_posts_version_key(author_id))
+
+
+def bump_author_posts_version(author_id):
+    cache.set(author_posts_version_key(author_id), time.time_ns(), None)
+
+
+def get_post_author_id(post_id):
+    """Return the id of the post's author (or None), cached: it never changes."""
+    key = f"post:{post_id}:author"
+    author_id = cache.get(key)
+    if author_id is None:
+        author_id = (
+            Post.objects.filter(pk=post_id).values_list("author_id", flat=True).first()
+        )
+        if author_id is not None:
+            cache.set(key, author_id, None)
+    return author_id
+
+
+def post_version_key(post_id):
+    return f"post:{post_id}:version"
+
+
+def _stamp(backend, key):
+    """Return the version stamp stored at ``key``, creating one if missing.
+
+    Stamps are unique tokens rather than counters, so if a stamp is evicted
+    the new one can never collide with entries cached under the old one.  A
+    bump is only seen by processes sharing the backend.
+    """
+    version = backend.get(key)
+    if version is None:
+        backend.add(key, time.time_ns(), None)
+        version = backend.get(key)
+    return version
+
+
+async def _astamp(backend, key):
+    version = await backend.aget(key)
+    if version is None:
+        await backend.aadd(key, time.time_ns(), None)
+        version = await backend.aget(key)
+    return version
+
+
+def get_post_version(post_id):
+    """Return the post's current version stamp."""
+    return _stamp(cache, post_version_key(post_id))
+
+
+def get_post_versions(post_ids):
+    """Return ``{post_id: version stamp}`` for many posts in one cache lookup."""
+    keys = {post_version_key(post_id): post_id for post_id in post_ids}
+    versions = cache.get_many(list(keys))
+    missing = [key for key in keys if key not in versions]
+    for key in missing:
+        cache.add(key, time.time_ns(), None)
+    if missing:
+        versions.update(cache.get_many(missing))
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def get_reaction_breakdowns(post_ids):
+    """Return ``{post_id: reaction breakdown}`` for the posts that exist.
+
+    Entries are cached under the post's version, which every reaction change
+    bumps, so they are never stale as long as every process shares the default
+    cache (see CACHES); all misses are read in one query.
+    """
+    versions = get_post_versions(post_ids)
+    keys = {
+        f"reactions:{post_id}:{version}": post_id for post_id, version in versions.items()
+    }
+    cached = cache.get_many(list(keys))
+    breakdowns = {keys[key]: breakdown for key, breakdown in cached.items()}
+    missing = [post_id for key, post_id in keys.items() if key not in cached]
+    for post_id in versions:
+        _record("reaction_counts", post_id not in missing)
+    if missing:
+        rows = dict(
+            Post.objects.filter(pk__in=missing).values_list("pk", "reaction_breakdown")
+        )
+        cache.set_many(
+            {
+                f"reactions:{post_id}:{versions[post_id]}": breakdown
+                for post_id, breakdown in rows.items()
+            },
+            getattr(settings, "REACTION_COUNTS_CACHE_TIMEOUT", 300),
+        )
+        breakdowns.update(rows)
+    return breakdowns
+
+
+TIMELINE_VERSION_KEY = "timeline:version"
+
+TIMELINE_NEWEST_KEY = "timeline:newest"
+
+
+def get_timeline_version():
+    """Return a stamp that changes whenever the timeline's first page does."""
+    return _stamp(cache, TIMELINE_VERSION_KEY)
+
+
+async def aget_timeline_version():
+    return await _astamp(cache, TIMELINE_VERSION_KEY)
+
+
+def bump_timeline_version(reorder=False):
+    """Give the timeline a new stamp.
+
+    Pass ``reorder`` when a post was added or deleted, so the ids on the first
+    page are read again.
+    """
+    cache.set(TIMELINE_VERSION_KEY, time.time_ns(), None)
+    if reorder:
+        cache.delete(TIMELINE_NEWEST_KEY)
+
+
+def newest_post_ids():
+    """Return the first page's post ids, cached until a post is added or deleted."""
+    post_ids = cache.get(TIMELINE_NEWEST_KEY)
+    if post_ids is None:
+        page_size = getattr(settings, "TIMELINE_PAGE_SIZE", 20)
+        post_ids = frozenset(
+            keyset_queryset(Post.objects.all()).values_list("pk", flat=True)[:page_size]
+        )
+        cache.set(TIMELINE_NEWEST_KEY, post_ids, None)
+    return post_ids
+
+
+def bump_post_version(post_id):
+    """Invalidate every cached fragment of a post by giving it a new stamp."""
+    cache.set(post_version_key(post_id), time.time_ns(), None)
+
+
+def bump_post_versions(post_ids, author_ids=()):
+    """New stamps for many posts and their authors' post lists, in one write."""
+    now = time.time_ns()
+    stamps = {post_version_key(post_id): now for post_id in post_ids}
+    stamps.update(
+        {author_posts_version_key(author_id): now for author_id in author_ids}
+    )
+    cache.set_many(stamps, None)
+
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _record(namespace, hit):
+    with _stats_lock:
+        counters = _stats.setdefault(namespace, {"hits": 0, "misses": 0})
+        counters["hits" if hit else "misses"] += 1
+
+
+def get_post_fragment(name, post_id, render):
+    """Return the cached ``name`` fragment for a post, rendering it on a miss."""
+    key = f"fragment:{name}:{post_id}:{get_post_version(post_id)}"
+    content = cache.get(key)
+    _record("post_fragments", content is not None)
+    if content is None:
+        content = render()
+        cache.set(key, content, getattr(settings, "POST_FRAGMENT_CACHE_TIMEOUT", 60))
+    return content
+
+
+CATALOG_VERSION_KEY = "catalog:version"
+
+
+def _catalog_cache():
+    return caches[getattr(settings, "CATALOG_CACHE_ALIAS", "catalog")]
+
+
+def bump_catalog_version():
+    """Invalidate every cached catalog entry by giving the catalog a new stamp."""
+    _catalog_cache().set(CATALOG_VERSION_KEY, time.time_ns(), None)
+
+
+def get_catalog_version():
+    return _stamp(_catalog_cache(), CATALOG_VERSION_KEY)
+
+
+def get_catalog():
+    """Return every Item, read through the catalog cache."""
+    backend = _catalog_cache()
+    version = get_catalog_version()
+    items = backend.get("items", version=version)
+    _record("catalog", items is not None)
+    if items is None:
+        items = list(Item.objects.all())
+        backend.set("items", items, version=version)
+    return items
+
+
+def get_catalog_item(item_id):
+    """Return the Item with ``item_id`` (or None), read through the catalog cache."""
+    backend = _catalog_cache()
+    version = get_catalog_version()
+    key = f"item:{item_id}"
+    item = backend.get(key, version=version)
+    _record("catalog", item is not None)
+    if item is None:
+        item = Item.objects.filter(pk=item_id).first()
+        if item is not None:
+            backend.set(key, item, version=version)
+    return item
+
+
+def get_cache_stats():
+    """Hit/miss counters of this process's read-through caches."""
+    with _stats_lock:
+        stats = {namespace: dict(counters) for namespace, counters in _stats.items()}
+    for counters in stats.values():
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_ratio"] = round(counters["hits"] / lookups, 4) if lookups else None
+    return stats
@@ -0,0 +1,125 @@
+"""Conditional GET for pages whose freshness is cheap to check.
+
+The validators below build an ETag from version stamps in the cache (see
+``core.caching``) instead of the page's own queries, so a client revalidating
+an unchanged page gets a 304 before the view runs its main queryset or renders
+a template.  Every validator also covers the viewer, since pages show the
+logged-in account, and lapses after PAGE_ETAG_LIFETIME seconds so relative
+times ("5 minutes ago") and redeployed templates are never stale for longer.
+"""
+
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from .caching import (
+    aget_timeline_version,
+    get_account_version,
+    get_author_posts_version,
+    get_catalog_version,
+    get_post_versions,
+)
+from .middleware import aget_account, get_account
+from .reaction_buffer import buffered_writes
+from .reactions import parse_post_ids
+
+
+def condition(etag_func):
+    """Answer GET/HEAD with 304 when ``etag_func`` matches ``If-None-Match``.
+
+    Like Django's decorator of the same name, but an async view takes an async
+    ``etag_func``, so validators can await the cache and the session.
+    ``etag_func`` gets the view's arguments and may return None to skip.
+    """
+
+    def finish(response, etag):
+        if etag and response.status_code in (200, 304):
+            response.headers.setdefault("ETag", etag)
+            # Per-user pages: browsers may keep them, but must ask first.
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def inner(request, *args, **kwargs):
+                etag = None
+                if request.method in ("GET", "HEAD"):
+                    etag = await etag_func(request, *args, **kwargs)
+                    response = get_conditional_response(request, etag=etag)
+                    if response is not None:
+                        return finish(response, etag)
+                return finish(await view(request, *args, **kwargs), etag)
+
+        else:
+
+            @wraps(view)
+            def inner(request, *args, **kwargs):
+                etag = None
+                if request.method in ("GET", "HEAD"):
+                    etag = etag_func(request, *args, **kwargs)
+                    response = get_conditional_response(request, etag=etag)
+                    if response is not None:
+                        return finish(response, etag)
+                return finish(view(request, *args, **kwargs), etag)
+
+        return inner
+
+    return decorator
+
+
+def make_etag(request, viewer, *versions):
+    """A weak ETag (the body may be recompressed) over the page's inputs."""
+    lifetime = getattr(settings, "PAGE_ETAG_LIFETIME", 60)
+    parts = [
+        request.get_full_path(),
+        viewer.pk if viewer else "",
+        int(time.time() // lifetime),
+        *versions,
+    ]
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+async def timeline_etag(request):
+    if "cursor" in request.GET:
+        # The timeline stamp only follows counters of posts on the first page.
+        return None
+    viewer = await aget_account(request)
+    if viewer is None:
+        return None  # redirected to the login page
+    return make_etag(request, viewer, await aget_timeline_version())
+
+
+def profile_etag(request, user_id):
+    # The header shows the account's row; the cards are the author's posts.
+    return make_etag(
+        request,
+        get_account(request),
+        get_account_version(user_id),
+        get_author_posts_version(user_id),
+    )
+
+
+def catalog_etag(request, item_id=None):
+    return make_etag(request, get_account(request), get_catalog_version())
+
+
+def reactions_etag(request):
+    if buffered_writes():
+        return None  # unflushed clicks do not move post versions
+    try:
+        post_ids = parse_post_ids(request.GET.getlist("ids"))
+    except ValueError:
+        return None
+    versions = get_post_versions(post_ids)
+    return make_etag(
+        request,
+        get_account(request),
+        *(versions.get(post_id) for post_id in post_ids),
+    )
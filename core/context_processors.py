@@ -1,18 +1,9 @@
-from .models import Account
-
-
 def current_user(request):
     """Return the Account for the logged-in session user (if any).
 
     Templates will get `current_user` which is an `Account` instance or None.
     This keeps your session-based auth available in templates without passing
-    the object from every view.
+    the object from every view. The value is the lazy ``request.account`` set
+    by ``SessionAccountMiddleware``, so it reuses the view's lookup.
     """
-    user_id = request.session.get("user_id")
-    if not user_id:
-        return {"current_user": None}
-    try:
-        user = Account.objects.get(id=user_id)
-    except Account.DoesNotExist:
-        user = None
-    return {"current_user": user}
+    return {"current_user": getattr(request, "account", None)}
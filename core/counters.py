@@ -0,0 +1,159 @@
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from .caching import invalidate_account
+from .events import publish_reactions
+from .models import Account, Comment, Post, Reaction
+from .signals import send_post_changed, send_posts_changed
+
+
+def format_counts(breakdown):
+    """Shape a breakdown the way the reaction endpoints have always returned it."""
+    return [
+        {"reaction_type": reaction_type, "count": count}
+        for reaction_type, count in sorted(breakdown.items())
+    ]
+
+
+def adjust_breakdown(breakdown, added=None, removed=None):
+    """Apply one user's reaction change to ``breakdown`` in place.
+
+    ``added`` is the reaction type the user now has and ``removed`` the one they
+    had before (either may be None).  Returns the change in the total count.
+    """
+    if added == removed:
+        return 0
+    delta = 0
+    if removed:
+        remaining = breakdown.get(removed, 0) - 1
+        if remaining > 0:
+            breakdown[removed] = remaining
+        else:
+            breakdown.pop(removed, None)
+        delta -= 1
+    if added:
+        breakdown[added] = breakdown.get(added, 0) + 1
+        delta += 1
+    return delta
+
+
+def save_breakdown(post_id, author_id, breakdown, delta):
+    """Write a breakdown adjusted by ``adjust_breakdown`` back to the post row."""
+    Post.objects.filter(pk=post_id).update(
+        reaction_count=F("reaction_count") + delta,
+        reaction_breakdown=breakdown,
+    )
+    if delta:
+        Account.objects.filter(pk=author_id).update(
+            reactions_received=F("reactions_received") + delta
+        )
+    send_post_changed(post_id, author_id)
+    publish_reactions(post_id, format_counts(breakdown))
+
+
+def lock_breakdown(post_id):
+    """Lock the post row for the current transaction.
+
+    Returns ``(breakdown, author_id)``.
+    """
+    return (
+        Post.objects.select_for_update()
+        .values_list("reaction_breakdown", "author_id")
+        .get(pk=post_id)
+    )
+
+
+def apply_comment_change(post_id, delta=1, author_id=None):
+    """Adjust a post's active comment count by ``delta``.
+
+    ``author_id`` is the post's author, if the caller has it.
+    """
+    Post.objects.filter(pk=post_id).update(comment_count=F("comment_count") + delta)
+    send_post_changed(post_id, author_id)
+
+
+def apply_post_change(author_id, delta=1, reactions=0):
+    """Adjust an author's post count by ``delta`` and reactions by ``reactions``.
+
+    Pass the post's ``reaction_count`` negated when deleting it.  Called by
+    the ``Post`` save and delete receivers in ``core.signals``.
+    """
+    Account.objects.filter(pk=author_id).update(
+        post_count=F("post_count") + delta,
+        reactions_received=F("reactions_received") + reactions,
+    )
+    # The session account cache holds a copy of the row.
+    transaction.on_commit(lambda: invalidate_account(author_id))
+
+
+def rebuild_post_counters(post_ids, batch_size=500):
+    """Recompute the counters of ``post_ids`` from the reaction and comment tables."""
+    post_ids = iter(post_ids)
+    while batch := list(islice(post_ids, batch_size)):
+        breakdowns = {post_id: {} for post_id in batch}
+        reactions = (
+            Reaction.objects.filter(post_id__in=batch)
+            .values("post_id", "reaction_type")
+            .annotate(count=Count("id"))
+        )
+        for row in reactions:
+            breakdowns[row["post_id"]][row["reaction_type"]] = row["count"]
+
+        comment_counts = dict(
+            Comment.objects.filter(post_id__in=batch, is_active=True)
+            .values("post_id")
+            .annotate(count=Count("id"))
+            .values_list("post_id", "count")
+        )
+
+        authors = dict(
+            Post.objects.filter(pk__in=batch).values_list("pk", "author_id")
+        )
+        posts = [
+            Post(
+                pk=post_id,
+                reaction_breakdown=breakdown,
+                reaction_count=sum(breakdown.values()),
+                comment_count=comment_counts.get(post_id, 0),
+            )
+            for post_id, breakdown in breakdowns.items()
+        ]
+        with transaction.atomic():
+            Post.objects.bulk_update(
+                posts, ["reaction_breakdown", "reaction_count", "comment_count"]
+            )
+            # One signal for the batch: stamps are bumped in one cache write.
+            send_posts_changed(authors)
+
+
+def rebuild_account_counters(account_ids, batch_size=500):
+    """Recompute the profile stats of ``account_ids`` from their posts.
+
+    Reactions received are summed from the post counters, so rebuild those
+    first.
+    """
+    account_ids = iter(account_ids)
+    while batch := list(islice(account_ids, batch_size)):
+        stats = {
+            row["author_id"]: row
+            for row in Post.objects.filter(author_id__in=batch)
+            .values("author_id")
+            .annotate(posts=Count("id"), reactions=Sum("reaction_count"))
+            .order_by()
+        }
+        accounts = [
+            Account(
+                pk=account_id,
+                post_count=stats.get(account_id, {}).get("posts", 0),
+                reactions_received=stats.get(account_id, {}).get("reactions") or 0,
+            )
+            for account_id in batch
+        ]
+        with transaction.atomic():
+            Account.objects.bulk_update(accounts, ["post_count", "reactions_received"])
+            for account in accounts:
+                transaction.on_commit(
+                    lambda account_id=account.pk: invalidate_account(account_id)
+                )
@@ -0,0 +1,98 @@
+"""Live per-post updates: reaction counts and new replies, as server-sent events.
+
+The stream is an endless async generator, which only works when Django runs
+under an ASGI server (e.g. ``uvicorn mysite.asgi:application``).  A WSGI
+server would drain it into a list before sending a byte and hold the worker
+forever, so ``live_updates`` keeps pages from opening it there.
+"""
+
+import asyncio
+import json
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.template.loader import render_to_string
+
+from .pubsub import get_pubsub
+
+
+def live_updates(request):
+    """Whether ``request`` may open an event stream: LIVE_UPDATES and ASGI."""
+    return getattr(settings, "LIVE_UPDATES", False) and isinstance(request, ASGIRequest)
+
+
+def post_channel(post_id):
+    return f"post:{post_id}"
+
+
+def publish_reactions(post_id, counts):
+    """Announce a post's new reaction counts once the transaction commits.
+
+    ``counts`` is shaped like ``format_counts`` output.
+    """
+    message = {
+        "type": "reactions",
+        "counts": counts,
+        "reaction_count": sum(count["count"] for count in counts),
+    }
+    transaction.on_commit(
+        lambda: get_pubsub().publish(post_channel(post_id), message)
+    )
+
+
+def publish_comment(comment):
+    """Announce a new reply, rendered once for every viewer, after commit."""
+
+    def publish():
+        html = render_to_string("details/_comment.html", {"comment": comment})
+        get_pubsub().publish(
+            post_channel(comment.post_id), {"type": "comment", "html": html}
+        )
+
+    transaction.on_commit(publish)
+
+
+def format_event(name, data):
+    return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+async def stream_post_events(post_id):
+    """Yield the post's updates as SSE text, at most one batch per interval.
+
+    Everything published while a batch is held back is coalesced: reaction
+    updates are snapshots, so only the latest is sent; new replies are sent
+    together in one event.  A comment line goes out when the post is quiet so
+    that proxies keep the connection open and dead clients are noticed.
+    """
+    interval = 1 / getattr(settings, "SSE_MAX_EVENTS_PER_SECOND", 2)
+    keepalive = getattr(settings, "SSE_KEEPALIVE", 15)
+
+    with get_pubsub().subscribe(post_channel(post_id)) as subscription:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                first = await asyncio.wait_for(subscription.get(), keepalive)
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            reactions = None
+            comments = []
+            for message in [first, *subscription.drain()]:
+                if message["type"] == "reactions":
+                    reactions = message
+                elif message["type"] == "comment":
+                    comments.append(message["html"])
+
+            if reactions is not None:
+                yield format_event(
+                    "reactions",
+                    {
+                        "counts": reactions["counts"],
+                        "reaction_count": reactions["reaction_count"],
+                    },
+                )
+            if comments:
+                yield format_event("comments", {"html": comments})
+            await asyncio.sleep(interval)
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with the iteration count taken from settings.
+
+    Hashes stay in the standard ``pbkdf2_sha256$`` format, so the stock hasher
+    can still verify them.  Changing ``PASSWORD_HASH_ITERATIONS`` makes
+    ``check_password`` re-hash each account at the new cost on its next login.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(
+            settings, "PASSWORD_HASH_ITERATIONS", PBKDF2PasswordHasher.iterations
+        )
@@ -0,0 +1,270 @@
+"""Serving uploaded media and collected static files.
+
+``serve_media`` answers ``Range`` requests (so ``<video>`` seeking fetches only
+the bytes it needs) and revalidates with ``ETag``/``Last-Modified``.  Bodies go
+out through ``FileResponse``, which WSGI servers with a ``wsgi.file_wrapper``
+(gunicorn, uWSGI) send with ``sendfile()``.  With a front proxy, set
+MEDIA_SERVE_MODE so Django only checks the request and hands the file to the
+proxy:
+
+    "django"            stream the file from Python (default)
+    "x-accel-redirect"  nginx; MEDIA_ACCEL_PREFIX is an ``internal`` location
+                        aliased to MEDIA_ROOT
+    "x-sendfile"        Apache mod_xsendfile, lighttpd
+
+Uploads are user content on the site's own origin, so only images and video
+are shown inline; anything else (HTML, SVG, PDF, ...) is sent as an
+``application/octet-stream`` attachment, and every media response carries a
+``sandbox`` Content-Security-Policy in case a browser renders it anyway.
+
+``serve_static`` serves ``collectstatic`` output when DEBUG is off and nothing
+in front does: it picks the pre-built ``.br``/``.gz`` variant the client
+accepts, and marks content-hashed names immutable for a year.
+"""
+
+import functools
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import (
+    content_disposition_header,
+    http_date,
+    parse_http_date_safe,
+)
+from django.views.decorators.http import require_safe
+
+from .storage import encodings
+
+BLOCK_SIZE = 64 * 1024
+
+IMMUTABLE_MAX_AGE = 365 * 86400
+
+# Types a browser may display inline.  SVG is an image/* type that runs
+# scripts, so it is excluded.
+INLINE_TYPES = ("image/", "video/")
+NOT_INLINE = {"image/svg+xml"}
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class FileRange:
+    """Read at most ``length`` bytes of an open file from its current position.
+
+    Exposes ``fileno()`` so ``wsgi.file_wrapper`` implementations can still
+    ``sendfile()`` the range, given the Content-Length.
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """Return ``(start, end)`` (inclusive) for a single-range header.
+
+    Returns None for headers this view ignores (multiple ranges, other units),
+    which are answered with the whole file, and raises ValueError for an
+    unsatisfiable range.
+    """
+    match = RANGE_RE.match(header.replace(" ", ""))
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        # "bytes=-500": the last 500 bytes.
+        length = int(last)
+        if not length:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def if_range_matches(request, etag, mtime):
+    """Whether a ``Range`` may be honoured under the request's ``If-Range``."""
+    condition = request.headers.get("If-Range")
+    if not condition:
+        return True
+    if condition.startswith(('"', "W/")):
+        return condition == etag
+    return parse_http_date_safe(condition) == int(mtime)
+
+
+def find_file(root, path):
+    """Return ``(full path, os.stat_result)`` for a file under ``root``, or 404."""
+    try:
+        fullpath = safe_join(root, path)
+        stat = os.stat(fullpath)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404("File not found.")
+    if not os.path.isfile(fullpath):
+        raise Http404("File not found.")
+    return fullpath, stat
+
+
+def media_type(fullpath):
+    """``(Content-Type, inline)`` for an uploaded file."""
+    content_type, encoding = mimetypes.guess_type(fullpath)
+    # Never let a browser transparently unpack a .gz upload.
+    if (
+        encoding
+        or not content_type
+        or content_type in NOT_INLINE
+        or not content_type.startswith(INLINE_TYPES)
+    ):
+        return "application/octet-stream", False
+    return content_type, True
+
+
+def file_etag(stat):
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+@require_safe
+def serve_media(request, path):
+    fullpath, stat = find_file(settings.MEDIA_ROOT, path)
+    size = stat.st_size
+    etag = file_etag(stat)
+    mtime = stat.st_mtime
+    # Returns a 304 or 412 when the client's copy is still current.
+    response = get_conditional_response(request, etag=etag, last_modified=int(mtime))
+    if response is not None:
+        return response
+
+    content_type, inline = media_type(fullpath)
+    mode = getattr(settings, "MEDIA_SERVE_MODE", "django")
+
+    if mode == "x-accel-redirect":
+        # nginx handles Range itself and keeps the headers set here.  It
+        # URL-decodes the header, and a raw name with "?", "#", "%" or
+        # non-ASCII would be mangled or not be a valid header value.
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = (
+            getattr(settings, "MEDIA_ACCEL_PREFIX", "/protected-media/").rstrip("/")
+            + "/"
+            + quote(path.lstrip("/"))
+        )
+    elif mode == "x-sendfile":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = fullpath
+    else:
+        response = range_response(request, fullpath, size, etag, mtime, content_type)
+        if response.status_code == 416:
+            return response
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(mtime)
+    response["Accept-Ranges"] = "bytes"
+    if not inline:
+        response["Content-Disposition"] = content_disposition_header(
+            True, os.path.basename(fullpath)
+        )
+    response["Content-Security-Policy"] = "sandbox"
+    response["X-Content-Type-Options"] = "nosniff"
+    patch_cache_control(
+        response, public=True, max_age=getattr(settings, "MEDIA_CACHE_MAX_AGE", 86400)
+    )
+    return response
+
+
+def range_response(request, fullpath, size, etag, mtime, content_type):
+    byte_range = None
+    header = request.headers.get("Range")
+    if header and if_range_matches(request, etag, mtime):
+        try:
+            byte_range = parse_range(header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    file = open(fullpath, "rb")
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, end = byte_range
+        file.seek(start)
+        response = FileResponse(
+            FileRange(file, end - start + 1), status=206, content_type=content_type
+        )
+        response["Content-Length"] = end - start + 1
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response.block_size = BLOCK_SIZE
+    return response
+
+
+def accepted_encodings(request):
+    accepted = set()
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+@require_safe
+def serve_static(request, path):
+    fullpath, stat = find_file(settings.STATIC_ROOT, path)
+    content_type, _ = mimetypes.guess_type(fullpath)
+
+    encoding = None
+    accepted = accepted_encodings(request)
+    for suffix, coding, _ in encodings():
+        if coding in accepted and os.path.isfile(fullpath + suffix):
+            fullpath, encoding = fullpath + suffix, coding
+            stat = os.stat(fullpath)
+            break
+
+    etag = file_etag(stat)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime)
+    )
+    if response is None:
+        response = FileResponse(
+            open(fullpath, "rb"),
+            content_type=content_type or "application/octet-stream",
+        )
+        response.block_size = BLOCK_SIZE
+        if encoding:
+            response["Content-Encoding"] = encoding
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(stat.st_mtime)
+    response["Vary"] = "Accept-Encoding"
+    if path in hashed_names():
+        # The name changes whenever the content does.
+        patch_cache_control(
+            response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True
+        )
+    else:
+        patch_cache_control(response, public=True, max_age=60)
+    return response
+
+
+@functools.cache
+def hashed_names():
+    """Content-hashed names from the manifest, read once per process."""
+    return frozenset(getattr(staticfiles_storage, "hashed_files", {}).values())
@@ -0,0 +1,127 @@
+"""Per-request query, database time and template render time accounting.
+
+A query recorder is installed on every database connection as it opens and
+a timing wrapper around every template; both report to the metrics of the
+request currently being served (a context variable set by
+``RequestMetricsMiddleware``), so they work the same for sync and async views.
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+
+from django.template.backends.django import DjangoTemplates
+
+current_metrics = ContextVar("current_metrics", default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode when a view issues more queries than budgeted."""
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_time += time.perf_counter() - start
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """``connection_created`` receiver adding ``record_query`` to the connection."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class TimedTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        metrics = current_metrics.get()
+        if metrics is None:
+            return self.template.render(context, request)
+        start = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            metrics.render_time += time.perf_counter() - start
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, timing each top-level render."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
+
+
+class ViewStats:
+    """Aggregated metrics per resolved URL name for this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view, metrics, size, over_budget):
+        with self._lock:
+            stats = self._views.setdefault(
+                view,
+                {
+                    "requests": 0,
+                    "queries": 0,
+                    "max_queries": 0,
+                    "db_ms": 0.0,
+                    "render_ms": 0.0,
+                    "total_ms": 0.0,
+                    "bytes": 0,
+                    "over_budget": 0,
+                },
+            )
+            stats["requests"] += 1
+            stats["queries"] += metrics.queries
+            stats["max_queries"] = max(stats["max_queries"], metrics.queries)
+            stats["db_ms"] += metrics.db_time * 1000
+            stats["render_ms"] += metrics.render_time * 1000
+            stats["total_ms"] += metrics.total_time * 1000
+            stats["bytes"] += size
+            stats["over_budget"] += over_budget
+
+    def snapshot(self):
+        with self._lock:
+            views = {view: dict(stats) for view, stats in self._views.items()}
+        for stats in views.values():
+            requests = stats["requests"]
+            for field in ("queries", "db_ms", "render_ms", "total_ms", "bytes"):
+                stats[f"avg_{field}"] = round(stats[field] / requests, 2)
+            for field in ("db_ms", "render_ms", "total_ms"):
+                stats[field] = round(stats[field], 2)
+        return views
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+request_stats = ViewStats()
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core.benchmarks import BENCHMARKS, load, test_database
+
+
+class Command(BaseCommand):
+    help = "Run a performance benchmark against a throwaway test database."
+
+    def add_arguments(self, parser):
+        subparsers = parser.add_subparsers(dest="benchmark", required=True)
+        for name in BENCHMARKS:
+            module = load(name)
+            module.add_arguments(subparsers.add_parser(name, help=module.help))
+
+    def handle(self, *args, **options):
+        module = load(options.pop("benchmark"))
+        with test_database(on_disk=getattr(module, "on_disk", False)):
+            module.run(self.stdout, **options)
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.media import run_jobs
+
+
+class Command(BaseCommand):
+    help = "Generate thumbnails and poster frames for queued post and comment media."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue once and exit instead of polling forever.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10,
+            help="Jobs claimed per batch (default: 10).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Seconds to sleep when the queue is empty (default: 2).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = run_jobs(options["batch_size"])
+            if processed:
+                self.stdout.write(f"Processed {processed} media job(s).")
+                continue
+            if options["once"]:
+                break
+            time.sleep(options["interval"])
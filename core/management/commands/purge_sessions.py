@@ -0,0 +1,52 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired sessions in small batches, once or on a schedule, so the "
+        "session table never grows unbounded or gets locked by one huge delete."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Seconds between purges; 0 (default) purges once and exits.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Sessions deleted per statement (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        store = import_module(settings.SESSION_ENGINE).SessionStore
+        while True:
+            if hasattr(store, "get_model_class"):
+                deleted = self.purge(store.get_model_class(), options["batch_size"])
+                self.stdout.write(f"Deleted {deleted} expired sessions.")
+            else:
+                # Cache and cookie sessions expire by themselves.
+                store.clear_expired()
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
+
+    def purge(self, model, batch_size):
+        deleted = 0
+        now = timezone.now()
+        while keys := list(
+            model.objects.filter(expire_date__lt=now).values_list(
+                "session_key", flat=True
+            )[:batch_size]
+        ):
+            model.objects.filter(session_key__in=keys).delete()
+            deleted += len(keys)
+        return deleted
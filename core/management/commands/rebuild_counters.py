@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from core.counters import rebuild_account_counters, rebuild_post_counters
+from core.models import Account, Post
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized post counters and account profile stats."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of rows recomputed per query batch (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        post_ids = Post.objects.order_by("pk").values_list("pk", flat=True)
+        rebuild_post_counters(post_ids.iterator(), batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS("Rebuilt counters for all posts."))
+
+        account_ids = Account.objects.order_by("pk").values_list("pk", flat=True)
+        rebuild_account_counters(
+            account_ids.iterator(), batch_size=options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS("Rebuilt profile stats for all accounts."))
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.reaction_buffer import recover_journals
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay buffered reaction changes journaled by a process that died before "
+        "flushing them.  Run it before the servers start."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--journal-dir",
+            default=getattr(settings, "REACTION_JOURNAL_DIR", None),
+            help="Journal directory (default: REACTION_JOURNAL_DIR).",
+        )
+
+    def handle(self, *args, **options):
+        directory = options["journal_dir"]
+        if not directory:
+            raise CommandError("No journal directory: set REACTION_JOURNAL_DIR.")
+        count = recover_journals(directory)
+        self.stdout.write(self.style.SUCCESS(f"Replayed {count} reaction changes."))
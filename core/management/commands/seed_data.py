@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.seeding import SEED_PASSWORD, seed_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic accounts, posts, comments, reactions, items and orders "
+        "for profiling at production-like volume."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--accounts", type=int, default=1000)
+        parser.add_argument("--posts", type=int, default=10_000)
+        parser.add_argument(
+            "--comments", type=int, default=5, help="Mean comments per post."
+        )
+        parser.add_argument(
+            "--reactions", type=int, default=10, help="Mean reactions per post."
+        )
+        parser.add_argument("--items", type=int, default=200)
+        parser.add_argument("--orders", type=int, default=2000)
+        parser.add_argument(
+            "--days", type=int, default=365, help="History the timestamps span."
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Rows per bulk_create (default: 5000).",
+        )
+        parser.add_argument("--seed", type=int, help="Random seed, for repeatable runs.")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        counts = seed_data(
+            accounts=options["accounts"],
+            posts=options["posts"],
+            comments=options["comments"],
+            reactions=options["reactions"],
+            items=options["items"],
+            orders=options["orders"],
+            days=options["days"],
+            chunk_size=options["chunk_size"],
+            seed=options["seed"],
+            log=self.stdout.write,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {sum(counts.values())} rows in "
+                f"{time.perf_counter() - start:.1f}s. "
+                f"Every account's password is {SEED_PASSWORD!r}."
+            )
+        )
@@ -0,0 +1,142 @@
+"""Out-of-request processing of uploaded post and comment media.
+
+Views only enqueue a ``MediaJob``; the ``process_media`` management command
+works through the queue, writing a resized, recompressed thumbnail for images
+and a poster frame for videos onto the owning Post or Comment.
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from datetime import timedelta
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .models import MediaJob
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_media_job(instance):
+    """Queue variant generation for a just-saved Post or Comment with media."""
+    if not (instance.image or instance.video):
+        return None
+    field = "comment" if instance._meta.model_name == "comment" else "post"
+    return MediaJob.objects.create(**{field: instance})
+
+
+def make_thumbnail(source):
+    """Return a downscaled, recompressed JPEG of ``source`` as a ContentFile."""
+    max_size = getattr(settings, "MEDIA_THUMBNAIL_SIZE", (640, 640))
+    quality = getattr(settings, "MEDIA_THUMBNAIL_QUALITY", 80)
+
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(max_size)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        buffer = BytesIO()
+        image.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+    return ContentFile(buffer.getvalue())
+
+
+def make_poster(video):
+    """Return a thumbnail of an early frame of ``video``, or None if unavailable.
+
+    Needs ``ffmpeg`` (``FFMPEG_BINARY``) and a storage backend with local paths.
+    """
+    ffmpeg = shutil.which(getattr(settings, "FFMPEG_BINARY", "ffmpeg"))
+    if not ffmpeg:
+        logger.warning("ffmpeg not found; skipping poster for %s", video.name)
+        return None
+    try:
+        video_path = video.path
+    except NotImplementedError:
+        logger.warning("Storage has no local paths; skipping poster for %s", video.name)
+        return None
+
+    fd, frame_path = tempfile.mkstemp(suffix=".jpg")
+    os.close(fd)
+    try:
+        subprocess.run(
+            [ffmpeg, "-y", "-loglevel", "error", "-ss", "1", "-i", video_path,
+             "-frames:v", "1", frame_path],
+            check=True,
+            timeout=60,
+        )
+        if not os.path.getsize(frame_path):
+            # Clips shorter than the seek offset produce no frame.
+            return None
+        return make_thumbnail(frame_path)
+    finally:
+        os.remove(frame_path)
+
+
+def process_job(job):
+    """Generate the variants for one job's Post or Comment."""
+    target = job.post or job.comment
+    stem = os.path.splitext(os.path.basename((target.image or target.video).name))[0]
+    update_fields = []
+
+    if target.image and not target.image_thumbnail:
+        target.image_thumbnail.save(
+            f"{stem}.jpg", make_thumbnail(target.image), save=False
+        )
+        update_fields.append("image_thumbnail")
+    if target.video and not target.video_poster:
+        poster = make_poster(target.video)
+        if poster is not None:
+            target.video_poster.save(f"{stem}.jpg", poster, save=False)
+            update_fields.append("video_poster")
+
+    if update_fields:
+        target.save(update_fields=update_fields)
+
+
+def claim_jobs(limit):
+    """Mark up to ``limit`` pending jobs as running and return them.
+
+    The conditional update makes claiming safe with several workers: a job
+    another worker claimed first is simply skipped.  Jobs left running longer
+    than ``MEDIA_JOB_TIMEOUT`` seconds by a worker that died are claimable again.
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=getattr(settings, "MEDIA_JOB_TIMEOUT", 600))
+    claimable = Q(status=MediaJob.PENDING) | Q(
+        status=MediaJob.RUNNING, updated_at__lt=cutoff
+    )
+    pending = MediaJob.objects.filter(claimable).order_by("created_at")
+    claimed = []
+    for pk in pending.values_list("pk", flat=True)[:limit]:
+        with transaction.atomic():
+            if MediaJob.objects.filter(claimable, pk=pk).update(
+                status=MediaJob.RUNNING, attempts=F("attempts") + 1, updated_at=now
+            ):
+                claimed.append(pk)
+    return MediaJob.objects.filter(pk__in=claimed).select_related("post", "comment")
+
+
+def run_jobs(limit=10):
+    """Process a batch of pending jobs.  Returns the number processed."""
+    max_attempts = getattr(settings, "MEDIA_JOB_MAX_ATTEMPTS", 3)
+    jobs = list(claim_jobs(limit))
+    for job in jobs:
+        try:
+            process_job(job)
+        except Exception as exc:
+            logger.exception("Media job %s failed", job.pk)
+            job.status = MediaJob.PENDING if job.attempts < max_attempts else MediaJob.FAILED
+            job.error = str(exc)
+        else:
+            job.status = MediaJob.DONE
+            job.error = ""
+        job.save(update_fields=["status", "error", "updated_at"])
+    return len(jobs)
@@ -0,0 +1,158 @@
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
+
+from .caching import aget_cached_account, get_cached_account
+from .instrumentation import (
+    QueryBudgetExceeded,
+    RequestMetrics,
+    current_metrics,
+    request_stats,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def get_account(request):
+    """Resolve the session's ``user_id`` to an Account once per request."""
+    if not hasattr(request, "_cached_account"):
+        user_id = request.session.get("user_id")
+        request._cached_account = get_cached_account(user_id) if user_id else None
+    return request._cached_account
+
+
+def log_in(request, account):
+    """Make ``account`` the session's user.
+
+    The session is only modified, and so written back, when the user actually
+    changes: logging in again on the same session costs no session write.
+    """
+    if request.session.get("user_id") != account.pk:
+        request.session["user_id"] = account.pk
+    request._cached_account = account
+
+
+async def aget_account(request):
+    """Async counterpart of ``get_account``.
+
+    Async views must resolve the account this way before rendering: it fills
+    the same per-request slot, so the lazy ``request.account`` used by the
+    ``current_user`` context processor never has to hit the database from the
+    event loop.
+    """
+    if not hasattr(request, "_cached_account"):
+        user_id = await request.session.aget("user_id")
+        request._cached_account = (
+            await aget_cached_account(user_id) if user_id else None
+        )
+    return request._cached_account
+
+
+class SessionAccountMiddleware(MiddlewareMixin):
+    """Attach the logged-in Account to the request as ``request.account``.
+
+    The lookup is lazy, so requests that never touch the account (static
+    pages, redirects) do not pay for it, and everything that does touch it —
+    views and the ``current_user`` context processor — shares one result.
+    """
+
+    def process_request(self, request):
+        request.account = SimpleLazyObject(lambda: get_account(request))
+
+
+class RequestMetricsMiddleware:
+    """Measure queries, DB time, render time and size of every response.
+
+    The numbers are aggregated per URL name for ``/stats/views/`` and, with
+    ``SERVER_TIMING_HEADER`` on, sent in each response's ``Server-Timing``
+    header.  When a view exceeds its
+    entry in ``VIEW_QUERY_BUDGETS`` a warning is logged, or with
+    ``QUERY_BUDGET_STRICT`` enabled (e.g. in tests) ``QueryBudgetExceeded`` is
+    raised.  Queries made while a streaming response is being consumed happen
+    after this middleware returns and are not counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        match = request.resolver_match
+        view = match.url_name if match and match.url_name else "unresolved"
+        size = 0 if response.streaming else len(response.content)
+
+        budget = getattr(settings, "VIEW_QUERY_BUDGETS", {}).get(view)
+        over_budget = budget is not None and metrics.queries > budget
+        request_stats.record(view, metrics, size, over_budget)
+
+        if getattr(settings, "SERVER_TIMING_HEADER", False):
+            response["Server-Timing"] = (
+                f"db;dur={metrics.db_time * 1000:.1f};"
+                f'desc="{metrics.queries} queries", '
+                f"tpl;dur={metrics.render_time * 1000:.1f}, "
+                f"total;dur={metrics.total_time * 1000:.1f}"
+            )
+
+        if over_budget:
+            message = (
+                f"View {view!r} issued {metrics.queries} queries "
+                f"(budget {budget}) for {request.path}"
+            )
+            if getattr(settings, "QUERY_BUDGET_STRICT", False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """``GZipMiddleware`` for rendered, non-streaming text responses only.
+
+    Streaming responses here are files (media, pre-compressed static assets),
+    server-sent events or a timeline streamed so its head arrives early; the
+    compressor would hold back events and early chunks in its buffer.
+    """
+
+    compressible_types = {
+        "application/javascript",
+        "application/json",
+        "image/svg+xml",
+        "text/css",
+        "text/html",
+        "text/javascript",
+        "text/plain",
+    }
+
+    def process_response(self, request, response):
+        content_type = response.get("Content-Type", "").partition(";")[0].strip()
+        if response.streaming or content_type not in self.compressible_types:
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:17
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_counters(apps, schema_editor):
+    Post = apps.get_model("core", "Post")
+    Reaction = apps.get_model("core", "Reaction")
+    Comment = apps.get_model("core", "Comment")
+
+    breakdowns = {}
+    reactions = Reaction.objects.values("post_id", "reaction_type").annotate(
+        count=Count("id")
+    )
+    for row in reactions:
+        breakdowns.setdefault(row["post_id"], {})[row["reaction_type"]] = row["count"]
+    comment_counts = dict(
+        Comment.objects.filter(is_active=True)
+        .values("post_id")
+        .annotate(count=Count("id"))
+        .values_list("post_id", "count")
+    )
+
+    for post in Post.objects.filter(pk__in=set(breakdowns) | set(comment_counts)):
+        post.reaction_breakdown = breakdowns.get(post.pk, {})
+        post.reaction_count = sum(post.reaction_breakdown.values())
+        post.comment_count = comment_counts.get(post.pk, 0)
+        post.save(
+            update_fields=["reaction_breakdown", "reaction_count", "comment_count"]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_post_timeline_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='reaction_breakdown',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='reaction_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_post_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='image_thumbnail',
+            field=models.ImageField(blank=True, null=True, upload_to='comments/thumbnails/'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='video_poster',
+            field=models.ImageField(blank=True, null=True, upload_to='comments/posters/'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_thumbnail',
+            field=models.ImageField(blank=True, null=True, upload_to='posts/thumbnails/'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='video_poster',
+            field=models.ImageField(blank=True, null=True, upload_to='posts/posters/'),
+        ),
+        migrations.CreateModel(
+            name='MediaJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('comment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='media_jobs', to='core.comment')),
+                ('post', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='media_jobs', to='core.post')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created_at'], name='core_mediaj_status_c78256_idx')],
+            },
+        ),
+    ]
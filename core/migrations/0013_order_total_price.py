@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:24
+
+from django.db import migrations, models
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum
+
+
+def backfill_totals(apps, schema_editor):
+    Order = apps.get_model("core", "Order")
+    orders = list(
+        Order.objects.annotate(
+            line_total=Sum(
+                ExpressionWrapper(
+                    F("orderitem__quantity") * F("orderitem__item__price"),
+                    output_field=DecimalField(max_digits=12, decimal_places=2),
+                )
+            )
+        )
+    )
+    for order in orders:
+        order.total_price = order.line_total or 0
+    Order.objects.bulk_update(orders, ["total_price"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_media_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='total_price',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_order_total_price'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'is_active', '-created_at', '-id'], name='comment_thread_idx'),
+        ),
+    ]
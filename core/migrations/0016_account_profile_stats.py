@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:32
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+
+
+def backfill_profile_stats(apps, schema_editor):
+    Account = apps.get_model("core", "Account")
+    Post = apps.get_model("core", "Post")
+
+    stats = (
+        Post.objects.values("author_id")
+        .annotate(
+            posts=Count("id"), reactions=Sum("reaction_count"), first=Min("created_at")
+        )
+        .order_by()
+    )
+    for row in stats:
+        account = Account.objects.get(pk=row["author_id"])
+        account.post_count = row["posts"]
+        account.reactions_received = row["reactions"] or 0
+        # Accounts predate this column; their first post is the best guess.
+        account.date_joined = min(account.date_joined, row["first"])
+        account.save(update_fields=["post_count", "reactions_received", "date_joined"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='account',
+            name='date_joined',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='account',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='account',
+            name='reactions_received',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_profile_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,105 @@
+from django.db import migrations
+
+# SQLite: one FTS5 table over posts, active comments and items, kept in sync by
+# triggers.  The rowid encodes the source row (id * 4 + kind) so a trigger can
+# replace an entry by rowid instead of scanning the index.
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE core_search USING fts5("
+    "title, body, tokenize = 'unicode61 remove_diacritics 2')",
+    # Posts (kind 1).
+    "CREATE TRIGGER core_search_post_ai AFTER INSERT ON core_post BEGIN "
+    "INSERT INTO core_search(rowid, title, body) VALUES (new.id * 4 + 1, '', new.content); "
+    "END",
+    "CREATE TRIGGER core_search_post_au AFTER UPDATE OF content ON core_post BEGIN "
+    "UPDATE core_search SET body = new.content WHERE rowid = new.id * 4 + 1; "
+    "END",
+    "CREATE TRIGGER core_search_post_ad AFTER DELETE ON core_post BEGIN "
+    "DELETE FROM core_search WHERE rowid = old.id * 4 + 1; "
+    "END",
+    # Active comments (kind 2).
+    "CREATE TRIGGER core_search_comment_ai AFTER INSERT ON core_comment "
+    "WHEN new.is_active BEGIN "
+    "INSERT INTO core_search(rowid, title, body) VALUES (new.id * 4 + 2, '', new.content); "
+    "END",
+    "CREATE TRIGGER core_search_comment_au AFTER UPDATE OF content, is_active "
+    "ON core_comment BEGIN "
+    "DELETE FROM core_search WHERE rowid = old.id * 4 + 2; "
+    "INSERT INTO core_search(rowid, title, body) "
+    "SELECT new.id * 4 + 2, '', new.content WHERE new.is_active; "
+    "END",
+    "CREATE TRIGGER core_search_comment_ad AFTER DELETE ON core_comment BEGIN "
+    "DELETE FROM core_search WHERE rowid = old.id * 4 + 2; "
+    "END",
+    # Items (kind 3).
+    "CREATE TRIGGER core_search_item_ai AFTER INSERT ON core_item BEGIN "
+    "INSERT INTO core_search(rowid, title, body) "
+    "VALUES (new.id * 4 + 3, new.name, new.description); "
+    "END",
+    "CREATE TRIGGER core_search_item_au AFTER UPDATE OF name, description "
+    "ON core_item BEGIN "
+    "UPDATE core_search SET title = new.name, body = new.description "
+    "WHERE rowid = new.id * 4 + 3; "
+    "END",
+    "CREATE TRIGGER core_search_item_ad AFTER DELETE ON core_item BEGIN "
+    "DELETE FROM core_search WHERE rowid = old.id * 4 + 3; "
+    "END",
+    # Existing rows.
+    "INSERT INTO core_search(rowid, title, body) "
+    "SELECT id * 4 + 1, '', content FROM core_post",
+    "INSERT INTO core_search(rowid, title, body) "
+    "SELECT id * 4 + 2, '', content FROM core_comment WHERE is_active",
+    "INSERT INTO core_search(rowid, title, body) "
+    "SELECT id * 4 + 3, name, description FROM core_item",
+]
+
+SQLITE_BACKWARD = [
+    f"DROP TRIGGER core_search_{table}_{event}"
+    for table in ("post", "comment", "item")
+    for event in ("ai", "au", "ad")
+] + ["DROP TABLE core_search"]
+
+# PostgreSQL: stored tsvector columns the database keeps up to date itself,
+# each with a GIN index.  They are not on the models; core.search reads them.
+POSTGRES_FORWARD = [
+    "ALTER TABLE core_post ADD COLUMN search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('english', content)) STORED",
+    "CREATE INDEX post_search_idx ON core_post USING gin (search_vector)",
+    "ALTER TABLE core_comment ADD COLUMN search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('english', content)) STORED",
+    "CREATE INDEX comment_search_idx ON core_comment USING gin (search_vector) "
+    "WHERE is_active",
+    "ALTER TABLE core_item ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', name), 'A') || "
+    "setweight(to_tsvector('english', description), 'B')) STORED",
+    "CREATE INDEX item_search_idx ON core_item USING gin (search_vector)",
+]
+
+POSTGRES_BACKWARD = [
+    f"ALTER TABLE core_{table} DROP COLUMN search_vector"
+    for table in ("post", "comment", "item")
+]
+
+
+def run_for_vendor(sqlite, postgres):
+    def run(apps, schema_editor):
+        statements = {"sqlite": sqlite, "postgresql": postgres}.get(
+            schema_editor.connection.vendor, []
+        )
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0016_account_profile_stats"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor(SQLITE_FORWARD, POSTGRES_FORWARD),
+            run_for_vendor(SQLITE_BACKWARD, POSTGRES_BACKWARD),
+        ),
+    ]
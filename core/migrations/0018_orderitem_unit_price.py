@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:27
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_unit_prices(apps, schema_editor):
+    # Earlier lines kept no price; the item's current one is the best guess.
+    Item = apps.get_model("core", "Item")
+    OrderItem = apps.get_model("core", "OrderItem")
+    OrderItem.objects.update(
+        unit_price=Subquery(
+            Item.objects.filter(pk=OuterRef("item_id")).values("price")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderitem',
+            name='unit_price',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.RunPython(backfill_unit_prices, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,7 @@
+from django.contrib.auth import hashers
 from django.db import models
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
 
 
 class Account(models.Model):
@@ -10,6 +13,34 @@ class Account(models.Model):
     )
     email = models.EmailField(unique=False)
     password = models.CharField(max_length=128)
+    date_joined = models.DateTimeField(default=timezone.now)
+
+    # Denormalized profile stats, maintained by core.counters.
+    post_count = models.PositiveIntegerField(default=0)
+    reactions_received = models.PositiveIntegerField(default=0)
+
+    def set_password(self, raw_password):
+        self.password = hashers.make_password(raw_password)
+
+    def check_password(self, raw_password):
+        """Return True if ``raw_password`` is correct, upgrading the stored hash.
+
+        Rows from before passwords were hashed hold the plain text; a match
+        replaces it with a hash.  Hashes made at an outdated cost are re-hashed.
+        """
+
+        def setter(raw_password):
+            self.set_password(raw_password)
+            self.save(update_fields=["password"])
+
+        try:
+            hashers.identify_hasher(self.password)
+        except ValueError:
+            if self.password and constant_time_compare(raw_password, self.password):
+                setter(raw_password)
+                return True
+            return False
+        return hashers.check_password(raw_password, self.password, setter)
 
     def __str__(self):
         return f"{self.username} ({self.display_name})" or "Anonymous"
@@ -20,20 +51,42 @@ class Post(models.Model):
     content = models.TextField(blank=True)
     image = models.ImageField(upload_to="posts/images/", null=True, blank=True)
     video = models.FileField(upload_to="posts/videos/", null=True, blank=True)
+    # Small variants generated out of request by core.media.
+    image_thumbnail = models.ImageField(
+        upload_to="posts/thumbnails/", null=True, blank=True
+    )
+    video_poster = models.ImageField(upload_to="posts/posters/", null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Denormalized counters, maintained by core.counters.
+    reaction_count = models.PositiveIntegerField(default=0)
+    reaction_breakdown = models.JSONField(default=dict, blank=True)
+    comment_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of the home timeline seeks on (created_at, id).
+            models.Index(fields=["-created_at", "-id"], name="post_timeline_idx"),
+            # A profile's posts, newest first.
+            models.Index(
+                fields=["author", "-created_at", "-id"], name="post_author_timeline_idx"
+            ),
+        ]
+
     def __str__(self):
         return f"Post by {self.author.username} at {self.created_at}"
 
+    @property
+    def feed_image(self):
+        """The resized image once processed, the original until then."""
+        return self.image_thumbnail or self.image
+
     @property
     def reaction_summary(self):
         """
-        Returns a dict of reaction emoji and counts, plus user's own reaction
+        Returns a dict of reaction emoji and counts
         """
-        from django.db.models import Count
-
-        reactions = self.reactions.values("reaction_type").annotate(count=Count("id"))  # type: ignore
-        return {r["reaction_type"]: r["count"] for r in reactions}
+        return self.reaction_breakdown
 
     def user_reaction(self, user):
         if not user.is_authenticated:
@@ -61,6 +114,14 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_completed = models.BooleanField(default=False)
     is_canceled = models.BooleanField(default=False)
+    # Stored when the order is placed so lists can show totals without a join.
+    total_price = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        indexes = [
+            # order_list: a user's orders, newest first.
+            models.Index(fields=["user", "-created_at"], name="order_user_created_idx"),
+        ]
 
     def __str__(self):
         return f"Order {self.id} by {self.user.username}"  # type: ignore
@@ -70,6 +131,8 @@ class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE)
     item = models.ForeignKey(Item, on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField(default=1)
+    # The item's price when the order was placed, which total_price is summed from.
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2, default=0)
 
     def __str__(self):
         return f"{self.quantity} x {self.item.name} in Order {self.order.id}"  # type: ignore
@@ -82,6 +145,12 @@ class Comment(models.Model):
     )
     image = models.ImageField(upload_to="comments/images/", null=True, blank=True)
     video = models.FileField(upload_to="comments/videos/", null=True, blank=True)
+    image_thumbnail = models.ImageField(
+        upload_to="comments/thumbnails/", null=True, blank=True
+    )
+    video_poster = models.ImageField(
+        upload_to="comments/posters/", null=True, blank=True
+    )
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
@@ -90,12 +159,26 @@ class Comment(models.Model):
         ordering = ["-created_at"]
         verbose_name = "Comment"
         verbose_name_plural = "Comments"
+        indexes = [
+            # Keyset pagination of a post's active replies.  Partial, so
+            # hidden comments take no space in it.
+            models.Index(
+                fields=["post", "-created_at", "-id"],
+                condition=models.Q(is_active=True),
+                name="comment_active_thread_idx",
+            ),
+        ]
 
     def __str__(self):
         return (
             f"Comment by {self.author.username} on Post {self.post.id}" or "No Content"  # type: ignore
         )
 
+    @property
+    def feed_image(self):
+        """The resized image once processed, the original until then."""
+        return self.image_thumbnail or self.image
+
 
 class Reaction(models.Model):
     post = models.ForeignKey("Post", on_delete=models.CASCADE, related_name="reactions")
@@ -107,6 +190,48 @@ class Reaction(models.Model):
 
     class Meta:
         unique_together = ("post", "user")  # One reaction per user per post
+        indexes = [
+            # Covers the per-post GROUP BY reaction_type when counters are rebuilt.
+            models.Index(fields=["post", "reaction_type"], name="reaction_post_type_idx"),
+        ]
 
     def __str__(self):
         return f"{self.reaction_type} by {self.user.username} on Post {self.post.id}"
+
+
+class MediaJob(models.Model):
+    """A queued request to generate small variants of uploaded media."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, null=True, blank=True, related_name="media_jobs"
+    )
+    comment = models.ForeignKey(
+        Comment,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="media_jobs",
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        target = f"Post {self.post_id}" if self.post_id else f"Comment {self.comment_id}"  # type: ignore
+        return f"Media job for {target} ({self.status})"
@@ -0,0 +1,90 @@
+from django.db import transaction
+from django.db.models import DecimalField, ExpressionWrapper, F
+from django.http import Http404
+
+from .caching import bump_catalog_version
+from .models import Item, Order, OrderItem
+
+
+def line_subtotal():
+    """``quantity * unit_price`` for an OrderItem row, computed in SQL.
+
+    Uses the price stored with the line, so the lines always add up to the
+    order's ``total_price`` even after an item's price changes.
+    """
+    return ExpressionWrapper(
+        F("quantity") * F("unit_price"),
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+
+
+def order_lines(order):
+    """Return ``(lines, total_items)`` for an order in one joined query.
+
+    Each line carries its item and an annotated ``subtotal``; the item count is
+    summed from the fetched lines.
+    """
+    lines = list(
+        OrderItem.objects.filter(order=order)
+        .select_related("item")
+        .annotate(subtotal=line_subtotal())
+        .order_by("pk")
+    )
+    return lines, sum(line.quantity for line in lines)
+
+
+class OrderError(Exception):
+    """Raised when a submitted order cannot be placed."""
+
+
+def parse_order_lines(item_ids, quantities):
+    """Merge submitted ``item_ids``/``quantities`` into ``{item_id: quantity}``."""
+    lines = {}
+    for raw_id, raw_quantity in zip(item_ids, quantities):
+        try:
+            item_id, quantity = int(raw_id), int(raw_quantity or 0)
+        except ValueError:
+            raise OrderError("Quantities must be whole numbers.")
+        if quantity < 0:
+            raise OrderError("Quantities cannot be negative.")
+        if quantity:
+            lines[item_id] = lines.get(item_id, 0) + quantity
+    return lines
+
+
+def place_order(user, lines):
+    """Create an order for ``lines`` and take its items out of stock.
+
+    Runs in one transaction with a constant number of queries regardless of
+    cart size: one locking ``in_bulk`` read of the items, one insert for the
+    order, one ``bulk_create`` for its lines and one ``bulk_update`` of stock.
+    """
+    if not lines:
+        raise OrderError("Your order has no items.")
+
+    with transaction.atomic():
+        items = Item.objects.select_for_update().in_bulk(list(lines))
+        if len(items) != len(lines):
+            raise Http404("No Item matches the given query.")
+
+        short = [item.name for pk, item in items.items() if item.stock < lines[pk]]
+        if short:
+            raise OrderError(f"Not enough stock for: {', '.join(short)}.")
+
+        total = sum(items[pk].price * quantity for pk, quantity in lines.items())
+        order = Order.objects.create(user=user, total_price=total)
+        OrderItem.objects.bulk_create(
+            OrderItem(
+                order=order,
+                item=items[pk],
+                quantity=quantity,
+                unit_price=items[pk].price,
+            )
+            for pk, quantity in lines.items()
+        )
+        for pk, item in items.items():
+            item.stock = F("stock") - lines[pk]
+        Item.objects.bulk_update(items.values(), ["stock"])
+        # bulk_update sends no post_save, so refresh cached stock explicitly.
+        transaction.on_commit(bump_catalog_version)
+    return order
@@ -0,0 +1,60 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+
+def encode_cursor(created_at, pk):
+    """Encode a ``(created_at, id)`` position as an opaque URL-safe token."""
+    raw = f"{created_at.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return the ``(created_at, id)`` position for a cursor, or None if invalid."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, pk = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except ValueError:
+        return None
+
+
+def keyset_queryset(queryset, cursor=None):
+    """Order newest-first on ``(created_at, id)`` and seek past ``cursor``.
+
+    The ordering matches the composite index on the model, so each page is an
+    index range scan no matter how deep into the table the cursor points.
+    """
+    queryset = queryset.order_by("-created_at", "-id")
+    position = decode_cursor(cursor)
+    if position:
+        created_at, pk = position
+        # The redundant ``created_at <= cursor`` bound lets the planner seek
+        # into the index; the OR alone would make it walk from the start.
+        queryset = queryset.filter(created_at__lte=created_at).filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+    return queryset
+
+
+def keyset_page(queryset, cursor=None, page_size=20):
+    """Return ``(rows, next_cursor)``; ``next_cursor`` is None on the last page."""
+    rows = list(keyset_queryset(queryset, cursor)[: page_size + 1])
+    return _split_page(rows, page_size)
+
+
+async def akeyset_page(queryset, cursor=None, page_size=20):
+    """Async counterpart of ``keyset_page``."""
+    rows = [row async for row in keyset_queryset(queryset, cursor)[: page_size + 1]]
+    return _split_page(rows, page_size)
+
+
+def _split_page(rows, page_size):
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].pk)
+    return rows, next_cursor
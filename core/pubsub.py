@@ -0,0 +1,85 @@
+"""Publish/subscribe hub behind the live update streams.
+
+``get_pubsub()`` returns the backend named by ``PUBSUB_BACKEND``.  A backend
+implements ``publish(channel, message)``, callable from any thread, and
+``subscribe(channel)``, called from the event loop that will consume the
+messages and returning a ``Subscription``-like context manager.  Messages are
+JSON-serializable dicts so that a backend can carry them between processes.
+"""
+
+import asyncio
+import threading
+from collections import defaultdict
+from functools import cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class Subscription:
+    """Messages published to one channel, queued for one consumer."""
+
+    def __init__(self, hub, channel):
+        self.hub = hub
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+
+    def put(self, message):
+        # Publishers run on request worker threads; hand over to our loop.
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, message)
+
+    async def get(self):
+        return await self.queue.get()
+
+    def drain(self):
+        """Return every message already queued, without waiting."""
+        messages = []
+        while not self.queue.empty():
+            messages.append(self.queue.get_nowait())
+        return messages
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.hub.unsubscribe(self)
+
+
+class LocalPubSub:
+    """Deliver messages to subscribers in the current process only.
+
+    Enough for a single ASGI process; run several and each viewer only sees
+    updates made through the process it is connected to.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.put(message)
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel)
+        with self._lock:
+            self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+
+@cache
+def get_pubsub():
+    backend = getattr(settings, "PUBSUB_BACKEND", "core.pubsub.LocalPubSub")
+    return import_string(backend)()
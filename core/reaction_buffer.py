@@ -0,0 +1,308 @@
+"""Write-behind buffer for reaction clicks (``REACTION_WRITE_MODE = "buffered"``).
+
+Toggles are applied to per-post state in process memory and answered from it
+straight away.  A background thread writes the accumulated changes to the
+database every ``REACTION_FLUSH_INTERVAL`` seconds, or sooner once
+``REACTION_FLUSH_MAX_PENDING`` changes are waiting.  Repeated clicks by one
+user on one post collapse to their final state, so a burst on a hot post costs
+one upsert per user and one counter update per flush instead of a locked
+transaction per click.
+
+Durability: unflushed changes live only in this process.  With
+``REACTION_JOURNAL_DIR`` set each change is also appended to a journal segment
+there, and ``manage.py recover_reactions`` replays the segments a crashed
+process left behind; without a journal a crash loses at most the clicks of one
+flush interval.  Journals record each user's resulting reaction rather than
+the click, so replaying them is idempotent.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+from .counters import adjust_breakdown, format_counts, lock_breakdown, save_breakdown
+from .events import publish_reactions
+from .models import Post, Reaction
+
+logger = logging.getLogger(__name__)
+
+
+def buffered_writes():
+    return getattr(settings, "REACTION_WRITE_MODE", "sync") == "buffered"
+
+
+def write_reactions(changes):
+    """Store ``{post_id: {user_id: reaction_type}}`` and adjust the counters.
+
+    Each value is the user's reaction after their clicks, None if removed.
+    Counters are adjusted against the rows actually stored, so applying the
+    same changes twice is harmless.  Posts deleted meanwhile are skipped.
+    """
+    with transaction.atomic():
+        for post_id, users in changes.items():
+            try:
+                breakdown, author_id = lock_breakdown(post_id)
+            except Post.DoesNotExist:
+                continue
+            stored = dict(
+                Reaction.objects.filter(
+                    post_id=post_id, user_id__in=list(users)
+                ).values_list("user_id", "reaction_type")
+            )
+            changed = {
+                user_id: current
+                for user_id, current in users.items()
+                if stored.get(user_id) != current
+            }
+            if not changed:
+                continue
+
+            delta = 0
+            for user_id, current in changed.items():
+                delta += adjust_breakdown(
+                    breakdown, added=current, removed=stored.get(user_id)
+                )
+            removed = [user_id for user_id, current in changed.items() if current is None]
+            if removed:
+                Reaction.objects.filter(post_id=post_id, user_id__in=removed).delete()
+            Reaction.objects.bulk_create(
+                [
+                    Reaction(post_id=post_id, user_id=user_id, reaction_type=current)
+                    for user_id, current in changed.items()
+                    if current is not None
+                ],
+                update_conflicts=True,
+                unique_fields=["post", "user"],
+                update_fields=["reaction_type"],
+            )
+            save_breakdown(post_id, author_id, breakdown, delta)
+
+
+class ReactionBuffer:
+    """Reaction state of the posts clicked since their last flush."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # Breakdown and per-user reaction including unflushed changes.
+        self._breakdowns = {}
+        self._current = {}
+        # post_id -> {user_id: reaction_type or None}
+        self._pending = defaultdict(dict)
+        self._pending_count = 0
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._flusher = None
+        self._journal = None
+        self._segment = 0
+        self._atexit_registered = False
+
+    def toggle(self, post_id, user_id, reaction_type):
+        """Buffered ``toggle_reaction``: same arguments and return value."""
+        with self._lock:
+            previous = self._load(post_id, user_id)
+            current = None if previous == reaction_type else reaction_type
+            breakdown = self._record(post_id, user_id, current, previous)
+        publish_reactions(post_id, format_counts(breakdown))
+        return breakdown, current
+
+    def set(self, post_id, user_id, reaction_type):
+        """Give the user ``reaction_type`` on the post; returns the breakdown."""
+        with self._lock:
+            previous = self._load(post_id, user_id)
+            breakdown = self._record(post_id, user_id, reaction_type, previous)
+        publish_reactions(post_id, format_counts(breakdown))
+        return breakdown
+
+    def peek(self, post_ids, user_id):
+        """Unflushed state of ``post_ids``: ``(breakdowns, user_id's reactions)``.
+
+        Only posts with changes waiting in this process appear; the database
+        is current for the rest.
+        """
+        with self._lock:
+            breakdowns = {
+                post_id: dict(self._breakdowns[post_id])
+                for post_id in post_ids
+                if post_id in self._breakdowns
+            }
+            current = {
+                post_id: self._current[(post_id, user_id)]
+                for post_id in post_ids
+                if (post_id, user_id) in self._current
+            }
+        return breakdowns, current
+
+    def _load(self, post_id, user_id):
+        # Raises Post.DoesNotExist for an unknown post, like toggle_reaction.
+        if post_id not in self._breakdowns:
+            self._breakdowns[post_id] = Post.objects.values_list(
+                "reaction_breakdown", flat=True
+            ).get(pk=post_id)
+        key = (post_id, user_id)
+        if key not in self._current:
+            self._current[key] = (
+                Reaction.objects.filter(post_id=post_id, user_id=user_id)
+                .values_list("reaction_type", flat=True)
+                .first()
+            )
+        return self._current[key]
+
+    def _record(self, post_id, user_id, current, previous):
+        breakdown = self._breakdowns[post_id]
+        adjust_breakdown(breakdown, added=current, removed=previous)
+        self._current[(post_id, user_id)] = current
+        self._add_pending(post_id, user_id, current)
+        self._start_flusher()
+        # A copy: the caller formats it after the lock is released.
+        return dict(breakdown)
+
+    def _add_pending(self, post_id, user_id, current):
+        self._pending[post_id][user_id] = current
+        self._pending_count += 1
+        self._append_journal(post_id, user_id, current)
+        if self._pending_count >= getattr(settings, "REACTION_FLUSH_MAX_PENDING", 1000):
+            self._wakeup.set()
+
+    def flush(self):
+        """Write every pending change to the database; returns how many."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, defaultdict(dict)
+                self._pending_count = 0
+                segment = self._rotate_journal()
+            try:
+                if batch:
+                    write_reactions(batch)
+            except Exception:
+                with self._lock:
+                    # Put the batch back behind anything clicked since.
+                    for post_id, users in batch.items():
+                        for user_id, current in users.items():
+                            if user_id not in self._pending[post_id]:
+                                self._add_pending(post_id, user_id, current)
+                raise
+            finally:
+                if segment is not None:
+                    segment.unlink(missing_ok=True)
+
+            with self._lock:
+                # Flushed state is in the database now; keep only what has
+                # changed again since, so memory stays bounded and untouched
+                # posts are re-read fresh.
+                for post_id, users in batch.items():
+                    pending = self._pending.get(post_id)
+                    for user_id in users:
+                        if not pending or user_id not in pending:
+                            self._current.pop((post_id, user_id), None)
+                    if not pending:
+                        self._breakdowns.pop(post_id, None)
+        return sum(len(users) for users in batch.values())
+
+    def stop(self, flush=True):
+        """Stop the flusher and forget all state, flushing it first by default.
+
+        ``flush=False`` drops unflushed changes the way a crash would, leaving
+        any journal segments on disk for ``recover_reactions``.
+        """
+        self._stopping.set()
+        self._wakeup.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self._stopping.clear()
+        self._wakeup.clear()
+        if flush:
+            self.flush()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            self._breakdowns.clear()
+            self._current.clear()
+            self._pending.clear()
+            self._pending_count = 0
+
+    def _start_flusher(self):
+        if self._flusher is not None:
+            return
+        self._flusher = threading.Thread(
+            target=self._run, name="reaction-flusher", daemon=True
+        )
+        self._flusher.start()
+        if not self._atexit_registered:
+            atexit.register(self.stop)
+            self._atexit_registered = True
+
+    def _run(self):
+        try:
+            while not self._stopping.is_set():
+                self._wakeup.wait(getattr(settings, "REACTION_FLUSH_INTERVAL", 1.0))
+                self._wakeup.clear()
+                if self._stopping.is_set():
+                    break
+                close_old_connections()
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception("Flushing buffered reactions failed; will retry.")
+        finally:
+            connection.close()
+
+    def _append_journal(self, post_id, user_id, current):
+        directory = getattr(settings, "REACTION_JOURNAL_DIR", None)
+        if not directory:
+            return
+        if self._journal is None:
+            self._segment += 1
+            path = Path(directory) / f"reactions-{os.getpid()}-{self._segment:06d}.journal"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._journal = open(path, "a", encoding="utf-8")
+        # Flushed to the OS on every change: survives the process, not the host.
+        self._journal.write(json.dumps([post_id, user_id, current]) + "\n")
+        self._journal.flush()
+
+    def _rotate_journal(self):
+        """Close the current segment and return its path (None if there is none)."""
+        if self._journal is None:
+            return None
+        self._journal.close()
+        path = Path(self._journal.name)
+        self._journal = None
+        return path
+
+
+reaction_buffer = ReactionBuffer()
+
+
+def recover_journals(directory):
+    """Replay journal segments in ``directory``; returns the changes written.
+
+    Only run this while no process is writing reactions to ``directory`` —
+    typically before starting the servers after a crash.
+    """
+    segments = sorted(
+        Path(directory).glob("reactions-*.journal"),
+        key=lambda path: (path.stat().st_mtime, path.name),
+    )
+    changes = defaultdict(dict)
+    for segment in segments:
+        for line in segment.read_text(encoding="utf-8").splitlines():
+            try:
+                post_id, user_id, current = json.loads(line)
+            except ValueError:
+                # A torn last line from the crash.
+                continue
+            changes[post_id][user_id] = current
+    if changes:
+        write_reactions(changes)
+    for segment in segments:
+        segment.unlink()
+    return sum(len(users) for users in changes.values())
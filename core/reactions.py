@@ -0,0 +1,134 @@
+from django.conf import settings
+from django.db import transaction
+
+from .caching import get_reaction_breakdowns
+from .counters import (
+    adjust_breakdown,
+    format_counts,
+    lock_breakdown,
+    save_breakdown,
+)
+from .models import Reaction
+from .reaction_buffer import buffered_writes, reaction_buffer
+
+
+def valid_reaction(value):
+    """Whether ``value`` can be stored as a ``Reaction.reaction_type``."""
+    max_length = Reaction._meta.get_field("reaction_type").max_length
+    return isinstance(value, str) and 1 <= len(value) <= max_length
+
+
+def toggle_reaction(post_id, user_id, reaction_type):
+    """Toggle ``user_id``'s ``reaction_type`` on a post.
+
+    Choosing the reaction the user already has removes it; anything else
+    replaces it via an upsert on the ``(post, user)`` unique constraint.
+    Returns ``(breakdown, current)`` where ``current`` is the user's reaction
+    afterwards (or None).  Raises ``Post.DoesNotExist`` for an unknown post.
+
+    The post row is locked first, so concurrent clicks on the same post queue
+    up behind each other instead of racing to insert the same ``(post, user)``
+    row or double-counting.  Counts come from the maintained breakdown, never
+    from a recount.
+    """
+    with transaction.atomic():
+        breakdown, author_id = lock_breakdown(post_id)
+        mine = Reaction.objects.filter(post_id=post_id, user_id=user_id)
+        previous = mine.values_list("reaction_type", flat=True).first()
+
+        if previous == reaction_type:
+            mine.delete()
+            current = None
+        else:
+            Reaction.objects.bulk_create(
+                [
+                    Reaction(
+                        post_id=post_id, user_id=user_id, reaction_type=reaction_type
+                    )
+                ],
+                update_conflicts=True,
+                unique_fields=["post", "user"],
+                update_fields=["reaction_type"],
+            )
+            current = reaction_type
+
+        delta = adjust_breakdown(breakdown, added=current, removed=previous)
+        save_breakdown(post_id, author_id, breakdown, delta)
+    return breakdown, current
+
+
+def set_reaction(post_id, user_id, reaction_type):
+    """Give ``user_id`` the ``reaction_type`` on a post, replacing any other.
+
+    Choosing the reaction the user already has keeps it.  As in
+    ``toggle_reaction``, the previous reaction is read under the post's row
+    lock, so concurrent requests cannot both count the same change.  Returns
+    the post's breakdown.
+    """
+    with transaction.atomic():
+        breakdown, author_id = lock_breakdown(post_id)
+        previous = (
+            Reaction.objects.filter(post_id=post_id, user_id=user_id)
+            .values_list("reaction_type", flat=True)
+            .first()
+        )
+        if previous != reaction_type:
+            Reaction.objects.update_or_create(
+                post_id=post_id,
+                user_id=user_id,
+                defaults={"reaction_type": reaction_type},
+            )
+            delta = adjust_breakdown(breakdown, added=reaction_type, removed=previous)
+            save_breakdown(post_id, author_id, breakdown, delta)
+    return breakdown
+
+
+def parse_post_ids(values):
+    """Parse ``?ids=1,2,3`` (or repeated ``ids``) into unique ints, in order.
+
+    Raises ValueError for a malformed id or more than REACTION_BATCH_MAX_IDS.
+    """
+    post_ids = []
+    for value in values:
+        for part in value.split(","):
+            if part.strip():
+                try:
+                    post_ids.append(int(part))
+                except ValueError:
+                    raise ValueError("Post ids must be integers.") from None
+    post_ids = list(dict.fromkeys(post_ids))
+    limit = getattr(settings, "REACTION_BATCH_MAX_IDS", 100)
+    if len(post_ids) > limit:
+        raise ValueError(f"At most {limit} post ids per request.")
+    return post_ids
+
+
+def reaction_states(post_ids, user_id=None):
+    """Reaction counts and ``user_id``'s own reaction for many posts.
+
+    Returns ``{post_id: {"counts", "reaction_count", "user_reaction"}}`` for
+    the posts that exist.  Breakdowns come through the cache (one query for
+    any misses) and the user's reactions from one more query; in buffered
+    mode, clicks this process has not flushed yet are applied on top.
+    """
+    breakdowns = get_reaction_breakdowns(post_ids)
+    mine = {}
+    if user_id is not None and breakdowns:
+        mine = dict(
+            Reaction.objects.filter(
+                user_id=user_id, post_id__in=list(breakdowns)
+            ).values_list("post_id", "reaction_type")
+        )
+    if buffered_writes():
+        pending, current = reaction_buffer.peek(list(breakdowns), user_id)
+        breakdowns.update(pending)
+        mine.update(current)
+    return {
+        post_id: {
+            "counts": format_counts(breakdowns[post_id]),
+            "reaction_count": sum(breakdowns[post_id].values()),
+            "user_reaction": mine.get(post_id),
+        }
+        for post_id in post_ids
+        if post_id in breakdowns
+    }
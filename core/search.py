@@ -0,0 +1,140 @@
+"""Full-text search over posts, active comments and items.
+
+SQLite queries the ``core_search`` FTS5 table and PostgreSQL the
+``search_vector`` columns; migration 0017 creates both and keeps them in sync
+inside the database, so bulk writes and ``update()`` are covered too.  Other
+databases fall back to ``icontains`` scans.
+"""
+
+import re
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+
+from .models import Comment, Item, Post
+
+# Kind codes, as stored in the low bits of the FTS5 rowid.
+KINDS = {1: "post", 2: "comment", 3: "item"}
+KIND_CODES = {name: code for code, name in KINDS.items()}
+
+MAX_TERMS = 8
+
+
+def terms(query):
+    """Split user input into plain words; search syntax is never passed through."""
+    return re.findall(r"\w+", query.lower())[:MAX_TERMS]
+
+
+def _sqlite_ranked(words, code, offset, limit):
+    # Every word must match; the last one as a prefix, for search-as-you-type.
+    match = " ".join(f'"{word}"' for word in words) + "*"
+    sql = "SELECT rowid FROM core_search WHERE core_search MATCH %s"
+    params = [match]
+    if code:
+        sql += " AND rowid %% 4 = %s"
+        params.append(code)
+    # Item names (the title column) weigh ten times their descriptions.
+    sql += " ORDER BY bm25(core_search, 10.0, 1.0) LIMIT %s OFFSET %s"
+    with connection.cursor() as cursor:
+        # A negative LIMIT is no limit in SQLite.
+        cursor.execute(sql, [*params, -1 if limit is None else limit, offset])
+        return [(rowid % 4, rowid // 4) for (rowid,) in cursor.fetchall()]
+
+
+POSTGRES_SOURCES = {
+    1: "SELECT 1 AS kind, id, ts_rank(search_vector, query) AS rank "
+    "FROM core_post, query WHERE search_vector @@ query",
+    2: "SELECT 2, id, ts_rank(search_vector, query) "
+    "FROM core_comment, query WHERE is_active AND search_vector @@ query",
+    3: "SELECT 3, id, ts_rank(search_vector, query) "
+    "FROM core_item, query WHERE search_vector @@ query",
+}
+
+
+def _postgres_ranked(words, code, offset, limit):
+    sources = [sql for kind, sql in POSTGRES_SOURCES.items() if code in (None, kind)]
+    sql = (
+        "WITH query AS (SELECT to_tsquery('english', %s) AS query) "
+        f"SELECT kind, id FROM ({' UNION ALL '.join(sources)}) hits "
+        "ORDER BY rank DESC, id DESC LIMIT %s OFFSET %s"
+    )
+    # Every word must match; the last one as a prefix.
+    query = " & ".join(words) + ":*"
+    with connection.cursor() as cursor:
+        # LIMIT NULL is no limit in PostgreSQL.
+        cursor.execute(sql, [query, limit, offset])
+        return cursor.fetchall()
+
+
+SCANS = {
+    1: (Post.objects.all(), ["content"]),
+    2: (Comment.objects.filter(is_active=True), ["content"]),
+    3: (Item.objects.all(), ["name", "description"]),
+}
+
+
+def _scan_ranked(words, code, offset, limit):
+    """Unindexed fallback: ``icontains`` on every word, newest rows first."""
+    end = None if limit is None else offset + limit
+    ranked = []
+    for kind, (queryset, fields) in SCANS.items():
+        if code not in (None, kind):
+            continue
+        for word in words:
+            queryset = queryset.filter(
+                reduce(or_, (Q(**{f"{field}__icontains": word}) for field in fields))
+            )
+        pks = queryset.order_by("-pk").values_list("pk", flat=True)[:end]
+        ranked.extend((kind, pk) for pk in pks)
+    return ranked[offset:end]
+
+
+def _ranked(words, kind, offset, limit):
+    code = KIND_CODES.get(kind)
+    if connection.vendor == "sqlite":
+        return _sqlite_ranked(words, code, offset, limit)
+    if connection.vendor == "postgresql":
+        return _postgres_ranked(words, code, offset, limit)
+    return _scan_ranked(words, code, offset, limit)
+
+
+def search_ids(query, kind, limit=None):
+    """Primary keys of the best ``limit`` matches of one kind, or of all."""
+    words = terms(query)
+    if not words:
+        return []
+    return [pk for _, pk in _ranked(words, kind, 0, limit)]
+
+
+def full_text_search(query, kind=None, page=1, page_size=None):
+    """Return ``(hits, has_next)`` for one page of results, best matches first.
+
+    Each hit is ``(kind, object)``.  ``kind`` limits the results to "post",
+    "comment" or "item".
+    """
+    words = terms(query)
+    if not words:
+        return [], False
+    page_size = page_size or getattr(settings, "SEARCH_PAGE_SIZE", 20)
+    ranked = _ranked(words, kind, (page - 1) * page_size, page_size + 1)
+    has_next = len(ranked) > page_size
+    ranked = ranked[:page_size]
+
+    objects = {}
+    for code, queryset in [
+        (1, Post.objects.select_related("author")),
+        (2, Comment.objects.select_related("author")),
+        (3, Item.objects.all()),
+    ]:
+        pks = [pk for kind_code, pk in ranked if kind_code == code]
+        if pks:
+            objects[code] = queryset.in_bulk(pks)
+    hits = [
+        (KINDS[code], objects[code][pk])
+        for code, pk in ranked
+        if pk in objects.get(code, {})
+    ]
+    return hits, has_next
@@ -0,0 +1,251 @@
+"""Synthetic data at production-like volume, for profiling and load tests.
+
+Rows are generated lazily and written with ``bulk_create`` a chunk at a time.
+Each chunk of posts gets its comments, reactions and rebuilt counters before
+the next is generated, so memory stays flat apart from the account and item
+ids that foreign keys are drawn from.  Per-post comment and reaction counts
+follow a heavy-tailed distribution around the requested mean: most posts get
+a few, a handful go viral.
+"""
+
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from .counters import rebuild_account_counters, rebuild_post_counters
+from .models import Account, Comment, Item, Order, OrderItem, Post, Reaction
+
+SEED_PASSWORD = "seed-password"
+
+REACTIONS = ["👍", "❤️", "😂", "😮", "😢", "🔥"]
+REACTION_WEIGHTS = [40, 25, 15, 8, 5, 7]
+
+WORDS = (
+    "the a launch today coffee weekend team update shipping new release bug fix "
+    "travel photo music game city rain sunny finally love hate think maybe why "
+    "what great awesome tired busy project deadline thanks everyone happy"
+).split()
+
+
+@contextmanager
+def backdated(*models):
+    """Let ``bulk_create`` store the ``created_at`` values set on the objects.
+
+    ``auto_now_add`` would otherwise overwrite them all with the current time.
+    """
+    fields = [model._meta.get_field("created_at") for model in models]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def create_in_chunks(model, objects, chunk_size):
+    """``bulk_create`` ``objects`` (any iterable) a chunk at a time.
+
+    Yields each created chunk, so only one is held in memory at a time.
+    """
+    objects = iter(objects)
+    while chunk := list(islice(objects, chunk_size)):
+        with transaction.atomic():
+            created = model.objects.bulk_create(chunk)
+        yield created
+
+
+def write_in_chunks(model, objects, chunk_size):
+    """Like ``create_in_chunks`` but yields nothing; returns the row count."""
+    objects = iter(objects)
+    count = 0
+    while chunk := list(islice(objects, chunk_size)):
+        with transaction.atomic():
+            model.objects.bulk_create(chunk)
+        count += len(chunk)
+    return count
+
+
+def heavy_tailed(rng, mean, limit):
+    # Pareto(1.5) has mean 3 and a long tail.
+    return min(limit, int(rng.paretovariate(1.5) * mean / 3))
+
+
+def sentence(rng, low=4, high=24):
+    return " ".join(rng.choices(WORDS, k=rng.randint(low, high))).capitalize()
+
+
+def seed_data(
+    accounts=1000,
+    posts=10_000,
+    comments=5,
+    reactions=10,
+    items=200,
+    orders=2000,
+    days=365,
+    chunk_size=5000,
+    seed=None,
+    log=None,
+):
+    """Generate the rows and return ``{model name: rows created}``.
+
+    ``comments`` and ``reactions`` are means per post.  Every account's
+    password is ``SEED_PASSWORD``.
+    """
+    rng = random.Random(seed)
+    log = log or (lambda message: None)
+    now = timezone.now()
+    span = timedelta(days=days).total_seconds()
+    # Distinguishes this run's usernames from earlier runs'.
+    run = uuid.uuid4().hex[:6]
+    password = make_password(SEED_PASSWORD)
+    counts = {}
+
+    def ago():
+        return now - timedelta(seconds=rng.random() * span)
+
+    account_ids = [
+        account.pk
+        for chunk in create_in_chunks(
+            Account,
+            (
+                Account(
+                    username=f"u{run}_{n}",
+                    display_name=f"User {n}",
+                    email=f"u{run}_{n}@example.com",
+                    password=password,
+                    date_joined=now - timedelta(seconds=span),
+                )
+                for n in range(accounts)
+            ),
+            chunk_size,
+        )
+        for account in chunk
+    ]
+    counts["accounts"] = len(account_ids)
+    log(f"accounts: {len(account_ids)}")
+
+    def after(created_at):
+        return created_at + (now - created_at) * rng.random()
+
+    counts["posts"] = counts["comments"] = counts["reactions"] = 0
+    with backdated(Post, Comment, Reaction, Order):
+        for chunk in create_in_chunks(
+            Post,
+            (
+                Post(
+                    author_id=rng.choice(account_ids),
+                    content=sentence(rng),
+                    created_at=ago(),
+                )
+                for _ in range(posts)
+            ),
+            chunk_size,
+        ):
+            post_times = [(post.pk, post.created_at) for post in chunk]
+            counts["posts"] += len(post_times)
+            counts["comments"] += write_in_chunks(
+                Comment,
+                (
+                    Comment(
+                        post_id=post_id,
+                        author_id=rng.choice(account_ids),
+                        content=sentence(rng, 1, 12),
+                        created_at=after(created_at),
+                    )
+                    for post_id, created_at in post_times
+                    for _ in range(heavy_tailed(rng, comments, 10 * comments + 1000))
+                ),
+                chunk_size,
+            )
+            counts["reactions"] += write_in_chunks(
+                Reaction,
+                (
+                    Reaction(
+                        post_id=post_id,
+                        user_id=user_id,
+                        reaction_type=rng.choices(REACTIONS, REACTION_WEIGHTS)[0],
+                        created_at=after(created_at),
+                    )
+                    for post_id, created_at in post_times
+                    # One reaction per user per post.
+                    for user_id in rng.sample(
+                        account_ids, heavy_tailed(rng, reactions, len(account_ids))
+                    )
+                ),
+                chunk_size,
+            )
+            # One post_changed per chunk (see rebuild_post_counters).
+            rebuild_post_counters([post_id for post_id, _ in post_times], chunk_size)
+            log(
+                f"posts: {counts['posts']} "
+                f"({counts['comments']} comments, {counts['reactions']} reactions)"
+            )
+
+        catalog = [
+            item
+            for chunk in create_in_chunks(
+                Item,
+                (
+                    Item(
+                        name=f"Item {n}",
+                        description=sentence(rng),
+                        price=Decimal(rng.randint(100, 20000)) / 100,
+                        stock=rng.randint(0, 500),
+                    )
+                    for n in range(items)
+                ),
+                chunk_size,
+            )
+            for item in chunk
+        ]
+        counts["items"] = len(catalog)
+        log(f"items: {len(catalog)}")
+
+        counts["orders"] = counts["order items"] = 0
+        remaining = orders
+        while remaining > 0 and catalog:
+            batch = min(chunk_size, remaining)
+            remaining -= batch
+            lines = [
+                [
+                    (item, rng.randint(1, 3))
+                    for item in rng.sample(catalog, min(len(catalog), rng.randint(1, 3)))
+                ]
+                for _ in range(batch)
+            ]
+            with transaction.atomic():
+                created = Order.objects.bulk_create(
+                    Order(
+                        user_id=rng.choice(account_ids),
+                        created_at=ago(),
+                        is_completed=(status := rng.random()) < 0.7,
+                        is_canceled=0.7 <= status < 0.8,
+                        total_price=sum(item.price * quantity for item, quantity in order),
+                    )
+                    for order in lines
+                )
+                order_items = OrderItem.objects.bulk_create(
+                    OrderItem(
+                        order_id=order.pk,
+                        item_id=item.pk,
+                        quantity=quantity,
+                        unit_price=item.price,
+                    )
+                    for order, order_lines in zip(created, lines)
+                    for item, quantity in order_lines
+                )
+            counts["orders"] += len(created)
+            counts["order items"] += len(order_items)
+        log(f"orders: {counts['orders']} ({counts['order items']} lines)")
+
+    rebuild_account_counters(account_ids, chunk_size)
+    log("counters rebuilt")
+    return counts
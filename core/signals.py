@@ -0,0 +1,88 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .caching import (
+    bump_author_posts_version,
+    bump_catalog_version,
+    bump_post_version,
+    bump_post_versions,
+    bump_timeline_version,
+    get_post_author_id,
+    invalidate_account,
+    newest_post_ids,
+)
+from .instrumentation import install_query_recorder
+from .models import Account, Item, Post
+
+# Sent with ``authors``, ``{post_id: author_id or None}``, when posts' comments
+# or reactions change.  Counter updates go through queryset ``update()``, which
+# fires no model signals.
+post_changed = Signal()
+
+
+connection_created.connect(install_query_recorder)
+
+
+def send_post_changed(post_id, author_id=None):
+    """Send ``post_changed`` once the current transaction commits.
+
+    Pass the author's id when it is at hand; otherwise it is looked up.
+    """
+    send_posts_changed({post_id: author_id})
+
+
+def send_posts_changed(authors):
+    """Send one ``post_changed`` for ``{post_id: author_id}`` after commit."""
+    transaction.on_commit(lambda: post_changed.send(sender=Post, authors=authors))
+
+
+@receiver([post_save, post_delete], sender=Account)
+def account_changed(sender, instance, **kwargs):
+    invalidate_account(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Post)
+def post_saved_or_deleted(sender, instance, signal, created=False, **kwargs):
+    bump_post_version(instance.pk)
+    bump_author_posts_version(instance.author_id)
+    # After commit, so the first page is not re-read without the new post.
+    reorder = created or signal is post_delete
+    transaction.on_commit(lambda: bump_timeline_version(reorder))
+
+
+@receiver(post_save, sender=Post)
+def post_created(sender, instance, created, raw=False, **kwargs):
+    # Here rather than in the views so posts added in the admin are counted.
+    # Fixtures (``raw``) carry their own counters.
+    if created and not raw:
+        from .counters import apply_post_change  # counters imports this module
+
+        apply_post_change(instance.author_id)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    from .counters import apply_post_change
+
+    apply_post_change(instance.author_id, -1, -instance.reaction_count)
+
+
+@receiver(post_changed)
+def post_activity(sender, authors, **kwargs):
+    author_ids = {
+        author_id if author_id is not None else get_post_author_id(post_id)
+        for post_id, author_id in authors.items()
+    }
+    author_ids.discard(None)
+    bump_post_versions(authors, author_ids)
+    # Counter changes only show on the timeline if the post is on its first
+    # page; later pages are not revalidated (see ``timeline_etag``).
+    if not newest_post_ids().isdisjoint(authors):
+        bump_timeline_version()
+
+
+@receiver([post_save, post_delete], sender=Item)
+def item_changed(sender, instance, **kwargs):
+    bump_catalog_version()
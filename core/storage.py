@@ -0,0 +1,56 @@
+"""Static file storage that pre-compresses what ``collectstatic`` writes.
+
+Each hashed text asset gets ``.gz`` and, when the optional ``brotli`` package
+is installed, ``.br`` siblings, built once at deploy time so neither Django
+(``core.http.serve_static``) nor a front proxy (nginx ``gzip_static`` /
+``brotli_static``) compresses on every request.
+"""
+
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+COMPRESSIBLE = (".css", ".js", ".json", ".map", ".svg", ".txt", ".html")
+
+# Below this, headers outweigh what compression saves.
+MIN_SIZE = 256
+
+
+def encodings():
+    """``(suffix, Content-Encoding, compress)`` for each variant that is built."""
+    variants = [(".gz", "gzip", lambda data: gzip.compress(data, 9, mtime=0))]
+    if brotli is not None:
+        variants.insert(0, (".br", "br", lambda data: brotli.compress(data)))
+    return variants
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = set()
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names.add(hashed_name)
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for hashed_name in sorted(hashed_names):
+            if hashed_name.endswith(COMPRESSIBLE):
+                self.compress(hashed_name)
+
+    def compress(self, name):
+        with self.open(name) as file:
+            data = file.read()
+        if len(data) < MIN_SIZE:
+            return
+        for suffix, _, compress in encodings():
+            compressed = compress(data)
+            if len(compressed) < len(data):
+                with open(self.path(name + suffix), "wb") as file:
+                    file.write(compressed)
@@ -0,0 +1,43 @@
+from django import template
+
+from core.caching import get_post_fragment
+
+register = template.Library()
+
+
+class PostFragmentNode(template.Node):
+    def __init__(self, nodelist, name, post):
+        self.nodelist = nodelist
+        self.name = name
+        self.post = post
+
+    def render(self, context):
+        post = self.post.resolve(context)
+        return get_post_fragment(
+            self.name.resolve(context),
+            post.pk,
+            lambda: self.nodelist.render(context),
+        )
+
+
+@register.tag
+def postfragment(parser, token):
+    """Cache the enclosed markup per post until the post changes.
+
+    Usage::
+
+        {% postfragment "timeline" post %} ... {% endpostfragment %}
+
+    The cache key includes the post's version stamp, which is replaced
+    whenever the post is edited or deleted or gains comments or reactions.
+    """
+    bits = token.split_contents()
+    if len(bits) != 3:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' tag requires a fragment name and a post."
+        )
+    nodelist = parser.parse(("endpostfragment",))
+    parser.delete_first_token()
+    return PostFragmentNode(
+        nodelist, parser.compile_filter(bits[1]), parser.compile_filter(bits[2])
+    )
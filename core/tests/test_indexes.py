@@ -0,0 +1,55 @@
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from core.benchmarks.explain import uses_index
+from core.models import Account, Comment, Post
+from core.pagination import encode_cursor, keyset_queryset
+
+
+class HotQueryIndexTests(TestCase):
+    """The keyset pages the views read are served by their indexes.
+
+    Mirrors part of ``manage.py bench explain``, so ``manage.py test`` fails
+    when a migration or a queryset change stops a page using its index.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.account = Account.objects.create(username="reader", email="r@example.com")
+        cls.post = Post.objects.create(author=cls.account, content="Post")
+        cls.cursor = encode_cursor(timezone.now(), 1)
+
+    def setUp(self):
+        if connection.vendor == "postgresql":
+            # Tiny tables make sequential scans cheapest; rule them out so the
+            # plan shows whether an index *can* serve the query.
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assertUsesIndex(self, queryset, table, index):
+        for cursor in (None, self.cursor):
+            with self.subTest(index=index, cursor=cursor):
+                plan = keyset_queryset(queryset, cursor)[:21].explain()
+                self.assertIn(index, plan)
+                # Past a cursor the index must be entered at a key, not walked.
+                self.assertTrue(
+                    uses_index(plan, table, seek=cursor is not None), plan
+                )
+
+    def test_timeline(self):
+        self.assertUsesIndex(Post.objects.all(), "core_post", "post_timeline_idx")
+
+    def test_profile_posts(self):
+        self.assertUsesIndex(
+            Post.objects.filter(author_id=self.account.pk),
+            "core_post",
+            "post_author_timeline_idx",
+        )
+
+    def test_comment_thread(self):
+        self.assertUsesIndex(
+            Comment.objects.filter(post_id=self.post.pk, is_active=True),
+            "core_comment",
+            "comment_active_thread_idx",
+        )
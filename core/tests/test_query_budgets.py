@@ -0,0 +1,102 @@
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+
+from core.benchmarks import logged_in_client
+from core.instrumentation import QueryBudgetExceeded
+from core.models import Account, Comment, Item, Post, Reaction
+from core.orders import place_order
+from core.pagination import encode_cursor
+
+
+def clear_caches():
+    for alias in settings.CACHES:
+        caches[alias].clear()
+
+
+@override_settings(
+    QUERY_BUDGET_STRICT=True,
+    # Tests run with DEBUG off and without collectstatic's manifest.
+    STORAGES={
+        **settings.STORAGES,
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    },
+)
+class QueryBudgetTests(TransactionTestCase):
+    """Every budgeted view stays within ``VIEW_QUERY_BUDGETS``.
+
+    Each request is the first after logging in: the session is cached, every
+    other cache entry (account, version stamps, first-page ids) is cold.
+
+    A transaction test case, so on-commit work (version stamps, counters)
+    runs inside the request as it does in production, and is counted.
+    """
+
+    def setUp(self):
+        self.account = Account.objects.create(username="reader", email="r@example.com")
+        self.other = Account.objects.create(username="writer", email="w@example.com")
+        self.posts = Post.objects.bulk_create(
+            Post(author=author, content=f"Post {n} about the weekend release")
+            for n in range(30)
+            for author in (self.account, self.other)
+        )
+        self.post = self.posts[-1]
+        Comment.objects.bulk_create(
+            Comment(post=self.post, author=self.other, content=f"Reply {n}")
+            for n in range(25)
+        )
+        Reaction.objects.create(post=self.post, user=self.other, reaction_type="👍")
+        self.item = Item.objects.create(
+            name="Mug", description="A mug", price=9, stock=100
+        )
+        self.order = place_order(self.account, {self.item.pk: 1})
+
+    def requests(self):
+        post, middle = self.post, self.posts[30]
+        cursor = encode_cursor(middle.created_at, middle.pk)
+        yield "get", reverse("post_list"), {}
+        yield "get", reverse("post_list_more"), {"cursor": cursor}
+        yield "get", reverse("post_detail", args=[post.pk]), {}
+        yield "get", reverse("post_comments", args=[post.pk]), {"cursor": cursor}
+        yield "get", reverse("get_profile", args=[self.other.pk]), {}
+        yield "get", reverse("profile_posts", args=[self.other.pk]), {"cursor": cursor}
+        yield "get", reverse("post_reactions"), {
+            "ids": ",".join(str(post.pk) for post in self.posts[:20])
+        }
+        yield "get", reverse("item_list"), {}
+        yield "get", reverse("item_detail", args=[self.item.pk]), {}
+        yield "get", reverse("order_list"), {}
+        yield "get", reverse("order_detail", args=[self.order.pk]), {}
+        yield "get", reverse("search"), {"q": "weekend"}
+        yield "post", reverse("react_to_post", args=[post.pk]), {"reaction": "❤️"}
+        yield "post", reverse("react_to_post", args=[post.pk]), {"reaction": "❤️"}
+        yield "post", reverse("comment_create", args=[post.pk]), {"content": "Nice"}
+        yield "post", reverse("order_create", args=[self.item.pk]), {"quantity": 2}
+
+    def test_budgeted_views_stay_within_budget(self):
+        covered = set()
+        for method, path, data in self.requests():
+            with self.subTest(path=path, method=method):
+                clear_caches()
+                self.client = logged_in_client(self.account)
+                if path.startswith("/react/"):
+                    response = self.client.post(
+                        path, json.dumps(data), content_type="application/json"
+                    )
+                else:
+                    response = getattr(self.client, method)(path, data)
+                # QueryBudgetExceeded propagates out of the client in strict mode.
+                self.assertLess(response.status_code, 400)
+                covered.add(response.resolver_match.url_name)
+        self.assertEqual(covered, set(settings.VIEW_QUERY_BUDGETS))
+
+    def test_strict_mode_raises(self):
+        self.client = logged_in_client(self.account)
+        with override_settings(VIEW_QUERY_BUDGETS={"search": 0}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(reverse("search"), {"q": "weekend"})
@@ -0,0 +1,116 @@
+import shutil
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+
+from core.models import Account, Post, Reaction
+from core.reaction_buffer import ReactionBuffer, recover_journals
+from core.reactions import toggle_reaction
+
+EMOJIS = ["👍", "❤️", "😂"]
+
+
+class ReactionBufferRecoveryTests(TestCase):
+    def setUp(self):
+        self.journal = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.journal, ignore_errors=True)
+        settings = override_settings(
+            REACTION_WRITE_MODE="buffered",
+            REACTION_JOURNAL_DIR=self.journal,
+            # Nothing is flushed unless a test asks for it.
+            REACTION_FLUSH_INTERVAL=3600,
+            REACTION_FLUSH_MAX_PENDING=10**9,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.authors = [
+            Account.objects.create(username=f"author{n}", email=f"a{n}@example.com")
+            for n in range(2)
+        ]
+        self.users = [
+            Account.objects.create(username=f"user{n}", email=f"u{n}@example.com")
+            for n in range(6)
+        ]
+        self.posts = [
+            Post.objects.create(author=author, content="Post")
+            for author in self.authors
+        ]
+        # Some reactions written through before the buffer is used.
+        for user in self.users[:3]:
+            toggle_reaction(self.posts[0].pk, user.pk, "👍")
+        # (post id, user id) -> the reaction the user was last told they have.
+        self.final = {(self.posts[0].pk, user.pk): "👍" for user in self.users[:3]}
+
+        self.buffer = ReactionBuffer()
+        self.addCleanup(self.buffer.stop, flush=False)
+
+    def click(self, rounds):
+        """Each user clicks every post ``rounds`` times."""
+        for n in range(rounds):
+            for post in self.posts:
+                for user in self.users:
+                    emoji = EMOJIS[(n + user.pk + post.pk) % len(EMOJIS)]
+                    _, current = self.buffer.toggle(post.pk, user.pk, emoji)
+                    self.final[post.pk, user.pk] = current
+
+    def stored(self):
+        return {
+            (post_id, user_id): reaction_type
+            for post_id, user_id, reaction_type in Reaction.objects.values_list(
+                "post_id", "user_id", "reaction_type"
+            )
+        }
+
+    def assertCountersMatchRows(self):
+        for post in Post.objects.all():
+            breakdown = Counter(
+                Reaction.objects.filter(post=post).values_list(
+                    "reaction_type", flat=True
+                )
+            )
+            self.assertEqual(post.reaction_breakdown, dict(breakdown))
+            self.assertEqual(post.reaction_count, sum(breakdown.values()))
+        for author in Account.objects.filter(pk__in=[a.pk for a in self.authors]):
+            received = Post.objects.filter(author=author).aggregate(
+                total=Sum("reaction_count")
+            )["total"]
+            self.assertEqual(author.reactions_received, received)
+            self.assertEqual(
+                author.reactions_received,
+                Reaction.objects.filter(post__author=author).count(),
+            )
+
+    def expected(self):
+        return {key: current for key, current in self.final.items() if current}
+
+    def test_crash_replay_restores_reactions_and_counters(self):
+        self.click(3)
+        self.buffer.flush()
+        # Clicked after the last flush, then lost in the crash.
+        self.click(2)
+        self.buffer.stop(flush=False)
+        self.assertNotEqual(self.stored(), self.expected())
+
+        replayed = recover_journals(self.journal)
+
+        self.assertGreater(replayed, 0)
+        self.assertEqual(self.stored(), self.expected())
+        self.assertCountersMatchRows()
+        self.assertEqual(list(Path(self.journal).iterdir()), [])
+
+    def test_replaying_a_journal_twice_is_harmless(self):
+        self.click(3)
+        self.buffer.stop(flush=False)
+        copy = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, copy, ignore_errors=True)
+        shutil.copytree(self.journal, copy, dirs_exist_ok=True)
+
+        recover_journals(self.journal)
+        recover_journals(copy)
+
+        self.assertEqual(self.stored(), self.expected())
+        self.assertCountersMatchRows()
@@ -0,0 +1,61 @@
+"""Login throttling kept entirely in the cache.
+
+Failed attempts are counted per username and per client IP in fixed windows.
+A throttled attempt is refused before the account is looked up or a password
+hashed, so a credential-stuffing burst costs cache hits, not database queries
+or CPU.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def _cache():
+    return caches[getattr(settings, "LOGIN_THROTTLE_CACHE_ALIAS", "default")]
+
+
+def _limits():
+    # scope -> (failed attempts allowed, window in seconds)
+    return getattr(
+        settings, "LOGIN_THROTTLE_LIMITS", {"username": (5, 300), "ip": (50, 300)}
+    )
+
+
+def _keys(username, ip):
+    # Usernames are user input; hashed, any name makes a valid memcached key,
+    # and case variants share one count.
+    username = hashlib.sha256((username or "").lower().encode()).hexdigest()
+    return {
+        "username": f"login-failures:username:{username}",
+        "ip": f"login-failures:ip:{ip}",
+    }
+
+
+def login_throttled(username, ip):
+    """Return True if ``username`` or ``ip`` has used up its failed attempts."""
+    keys = _keys(username, ip)
+    counts = _cache().get_many(keys.values())
+    return any(
+        counts.get(keys[scope], 0) >= allowed
+        for scope, (allowed, window) in _limits().items()
+    )
+
+
+def record_login_failure(username, ip):
+    backend = _cache()
+    keys = _keys(username, ip)
+    for scope, (allowed, window) in _limits().items():
+        # add() starts the window; incr() never extends it.
+        backend.add(keys[scope], 0, window)
+        try:
+            backend.incr(keys[scope])
+        except ValueError:
+            # The window expired between add() and incr().
+            backend.add(keys[scope], 1, window)
+
+
+def reset_login_failures(username):
+    """Clear the username's failures after a successful login."""
+    _cache().delete(_keys(username, None)["username"])
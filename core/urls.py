@@ -8,9 +8,12 @@ urlpatterns = [
     path("logout/", views.user_logout, name="user_logout"),
     path("create/", views.post_create, name="post_create"),
     path("home/", views.post_list, name="post_list"),
+    path("home/more/", views.post_list_more, name="post_list_more"),
     path("post/<int:post_id>/edit/", views.post_edit, name="post_edit"),
     path("post/<int:post_id>/delete/", views.post_delete, name="post_delete"),
     path("post/<int:post_id>/", views.post_detail, name="post_detail"),
+    path("post/<int:post_id>/comments/", views.post_comments, name="post_comments"),
+    path("post/<int:post_id>/events/", views.post_events, name="post_events"),
     # path('post/<int:post_id>/delete/', views.post_delete, name='post_delete'),
     path("items/", views.item_list, name="item_list"),
     path("items/create/", views.item_create, name="item_create"),
@@ -22,5 +25,10 @@ urlpatterns = [
     path("order/<int:order_id>/complete/", views.order_complete, name="order_complete"),
     path("comments/create/<int:post_id>/", views.comment_create, name="comment_create"),
     path("profile/<int:user_id>/", views.get_profile, name="get_profile"),
+    path("profile/<int:user_id>/posts/", views.profile_posts, name="profile_posts"),
+    path("search/", views.search, name="search"),
     path("react/<int:post_id>/", views.react_to_post, name="react_to_post"),
+    path("reactions/", views.post_reactions, name="post_reactions"),
+    path("stats/cache/", views.cache_stats, name="cache_stats"),
+    path("stats/views/", views.view_stats, name="view_stats"),
 ]
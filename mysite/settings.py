@@ -1,6 +1,8 @@
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = "django-insecure-please-change-this-in-production"
@@ -18,8 +20,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.RequestMetricsMiddleware",
+    # Compresses what the middleware below returns.  Django masks CSRF tokens
+    # per response, which is what keeps compressed pages safe from BREACH.
+    "core.middleware.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    "core.middleware.SessionAccountMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -31,7 +38,8 @@ ROOT_URLCONF = "mysite.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates, plus render timing for RequestMetricsMiddleware.
+        "BACKEND": "core.instrumentation.InstrumentedDjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -48,15 +56,127 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "mysite.wsgi.application"
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# Database profile, chosen with DB_PROFILE:
+#   sqlite           - single file; WAL journal, synchronous=NORMAL, busy timeout
+#                      and memory-mapped I/O applied on every connection.
+#   postgres         - persistent connections (CONN_MAX_AGE) with health checks.
+#   postgres-pooled  - psycopg connection pool per process (needs psycopg[pool]).
+DB_PROFILE = os.environ.get("DB_PROFILE", "sqlite")
+
+if DB_PROFILE == "sqlite":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+            "OPTIONS": {
+                # Take the write lock when a transaction starts, so SQLite
+                # serializes read-modify-write blocks (select_for_update is a
+                # no-op there) instead of failing one with "database is locked".
+                "transaction_mode": "IMMEDIATE",
+                # Seconds a writer waits for the lock before giving up.
+                "timeout": float(os.environ.get("SQLITE_BUSY_TIMEOUT", 5)),
+                "init_command": (
+                    "PRAGMA journal_mode=WAL;"
+                    "PRAGMA synchronous=NORMAL;"
+                    f"PRAGMA mmap_size={int(os.environ.get('SQLITE_MMAP_SIZE', 268435456))};"
+                    "PRAGMA temp_store=MEMORY;"
+                ),
+            },
+        }
+    }
+elif DB_PROFILE in ("postgres", "postgres-pooled"):
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("POSTGRES_DB", "mysite"),
+            "USER": os.environ.get("POSTGRES_USER", "mysite"),
+            "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
+            "HOST": os.environ.get("POSTGRES_HOST", "localhost"),
+            "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+            "CONN_MAX_AGE": int(os.environ.get("CONN_MAX_AGE", 60)),
+            "CONN_HEALTH_CHECKS": True,
+        }
     }
+    if DB_PROFILE == "postgres-pooled":
+        # The pool replaces persistent connections; Django requires CONN_MAX_AGE=0.
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"] = {
+            "pool": {
+                "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+                "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+                "timeout": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+            }
+        }
+else:
+    raise ImproperlyConfigured(f"Unknown DB_PROFILE {DB_PROFILE!r}.")
+
+CACHES = {
+    # Version stamps live here: post fragments, reaction counts and page ETags
+    # are only invalidated in the process that made the change while this is
+    # local memory.  Run more than one process only with CACHE_BACKEND and
+    # CACHE_LOCATION pointing at a shared cache (RedisCache, Memcached).
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    },
+    # Item catalog read-through cache.  Local memory (LRU-culled at MAX_ENTRIES)
+    # by default; point CATALOG_CACHE_BACKEND/LOCATION at FileBasedCache or
+    # RedisCache to share it between processes.
+    "catalog": {
+        "BACKEND": os.environ.get(
+            "CATALOG_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CATALOG_CACHE_LOCATION", "catalog"),
+        "TIMEOUT": int(os.environ.get("CATALOG_CACHE_TIMEOUT", 300)),
+        "OPTIONS": {"MAX_ENTRIES": int(os.environ.get("CATALOG_CACHE_MAX_ENTRIES", 1000))},
+    },
 }
+if CACHES["default"]["BACKEND"].endswith("LocMemCache"):
+    # Redis and Memcached clients reject culling options.
+    CACHES["default"]["OPTIONS"] = {"MAX_ENTRIES": 10000}
+
+# Session storage, chosen with SESSION_BACKEND:
+#   cached_db       - read from the cache, written through to the database.
+#   cache           - cache only; sessions vanish with the cache (use a shared one).
+#   signed_cookies  - stored in the client's cookie; no server-side reads or writes.
+#   db              - database only.
+SESSION_BACKEND = os.environ.get("SESSION_BACKEND", "cached_db")
+if SESSION_BACKEND not in ("cached_db", "cache", "signed_cookies", "db"):
+    raise ImproperlyConfigured(f"Unknown SESSION_BACKEND {SESSION_BACKEND!r}.")
+SESSION_ENGINE = f"django.contrib.sessions.backends.{SESSION_BACKEND}"
+SESSION_CACHE_ALIAS = "default"
+
+# Seconds a session user's Account stays in the cache between requests.
+ACCOUNT_CACHE_TIMEOUT = 300
+
+# Seconds a rendered timeline/profile card is reused.  Cards are invalidated as
+# soon as their post changes; the timeout only bounds how stale "x minutes ago"
+# can get.
+POST_FRAGMENT_CACHE_TIMEOUT = 60
 
 AUTH_PASSWORD_VALIDATORS = []
 
+# Account passwords.  The first hasher hashes new passwords; the others can
+# still verify older hashes, which are upgraded on the next login.  PBKDF2 cost
+# is tuned for login throughput (`manage.py bench logins` shows logins/sec for
+# a given value); 600,000 is OWASP's current minimum for PBKDF2-HMAC-SHA256.
+PASSWORD_HASHERS = [
+    "core.hashers.TunedPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+PASSWORD_HASH_ITERATIONS = int(os.environ.get("PASSWORD_HASH_ITERATIONS", 600_000))
+
+# Failed logins allowed per scope within a window of seconds, counted in the
+# cache so throttled attempts never reach the database.  Use a shared cache when
+# running several processes.
+LOGIN_THROTTLE_LIMITS = {"username": (5, 300), "ip": (50, 300)}
+LOGIN_THROTTLE_CACHE_ALIAS = "default"
+
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "Asia/Ho_Chi_Minh"
 USE_I18N = True
@@ -64,10 +184,111 @@ USE_TZ = True
 
 STATIC_URL = "/static/"
 STATICFILES_DIRS = [os.path.join(BASE_DIR, "static")]
+# `manage.py collectstatic` writes content-hashed copies here, with .gz (and,
+# if the brotli package is installed, .br) variants next to them.  With DEBUG
+# off, templates only resolve assets listed in the resulting manifest.
+STATIC_ROOT = os.environ.get("STATIC_ROOT", BASE_DIR / "staticfiles")
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "core.storage.CompressedManifestStaticFilesStorage"},
+}
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# How core.http.serve_media sends files: "django" streams them itself (with
+# sendfile() under gunicorn/uWSGI); "x-accel-redirect" (nginx) or "x-sendfile"
+# (Apache, lighttpd) leave it to the front proxy.  For nginx, map
+# MEDIA_ACCEL_PREFIX to MEDIA_ROOT in an ``internal`` location.
+MEDIA_SERVE_MODE = os.environ.get("MEDIA_SERVE_MODE", "django")
+if MEDIA_SERVE_MODE not in ("django", "x-accel-redirect", "x-sendfile"):
+    raise ImproperlyConfigured(f"Unknown MEDIA_SERVE_MODE {MEDIA_SERVE_MODE!r}.")
+MEDIA_ACCEL_PREFIX = "/protected-media/"
+# Uploads never change in place (new uploads get new names).
+MEDIA_CACHE_MAX_AGE = 86400
+
+# Variants generated by `manage.py process_media` for uploaded post/comment media.
+MEDIA_THUMBNAIL_SIZE = (640, 640)
+MEDIA_THUMBNAIL_QUALITY = 80
+MEDIA_JOB_MAX_ATTEMPTS = 3
+MEDIA_JOB_TIMEOUT = 600
+FFMPEG_BINARY = "ffmpeg"
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Maximum queries per request by URL name.  Exceeding one logs a warning, or
+# raises QueryBudgetExceeded when QUERY_BUDGET_STRICT is on (enable it in tests).
+VIEW_QUERY_BUDGETS = {
+    "post_list": 5,
+    "post_list_more": 4,
+    "post_detail": 5,
+    "post_comments": 3,
+    "react_to_post": 8,
+    "post_reactions": 3,
+    "comment_create": 8,
+    "get_profile": 5,
+    "profile_posts": 3,
+    "item_list": 3,
+    "item_detail": 3,
+    "order_create": 8,
+    "order_detail": 5,
+    "order_list": 3,
+    "search": 6,
+}
+QUERY_BUDGET_STRICT = False
+
+# Send each response's query count and timings in a Server-Timing header.
+# It describes the server's internals, so it is off unless DEBUG is on.
+SERVER_TIMING_HEADER = DEBUG
+
+# Home timeline: posts per keyset page, and whether to stream the page by default
+# (``?stream=1`` / ``?stream=0`` overrides per request).
+TIMELINE_PAGE_SIZE = 20
+TIMELINE_STREAMING = False
+
+# Replies per keyset page on the post detail page.
+COMMENTS_PAGE_SIZE = 20
+
+# Posts per keyset page on profile pages.
+PROFILE_PAGE_SIZE = 20
+
+# Seconds a page ETag (core.conditional) stays valid when nothing changed, which
+# bounds how stale relative times and a redeploy's templates can be after a 304.
+PAGE_ETAG_LIFETIME = 60
+
+# Full-text search (core.search): hits per page, and how many offset pages deep
+# a query may go.
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGES = 10
+
+# Reaction writes.  "sync" stores every click in its own transaction; "buffered"
+# answers from process memory and writes behind in coalesced batches every
+# REACTION_FLUSH_INTERVAL seconds, or once REACTION_FLUSH_MAX_PENDING changes
+# wait (see core.reaction_buffer).  Set REACTION_JOURNAL_DIR to journal
+# unflushed changes so `manage.py recover_reactions` can replay them after a
+# crash; without it a crash loses up to one interval of clicks.
+REACTION_WRITE_MODE = os.environ.get("REACTION_WRITE_MODE", "sync")
+REACTION_FLUSH_INTERVAL = float(os.environ.get("REACTION_FLUSH_INTERVAL", 1.0))
+REACTION_FLUSH_MAX_PENDING = 1000
+REACTION_JOURNAL_DIR = os.environ.get("REACTION_JOURNAL_DIR") or None
+
+# Batch reaction reads (``/reactions/?ids=...``): ids per request, and seconds a
+# post's cached breakdown is kept (entries are versioned, so never stale).
+REACTION_BATCH_MAX_IDS = 100
+REACTION_COUNTS_CACHE_TIMEOUT = 300
+
+# Live post updates (``/post/<id>/events/``).  Off by default: the endless event
+# stream needs an ASGI server, e.g. `pip install uvicorn` and
+# `uvicorn mysite.asgi:application`; under WSGI (runserver, gunicorn's sync
+# workers) pages never open it and the endpoint answers 204.
+LIVE_UPDATES = os.environ.get("LIVE_UPDATES", "") == "1"
+
+# The pub/sub backend fans published messages out to subscribers; the
+# in-process one only reaches viewers connected to the same process.  Each
+# stream sends at most SSE_MAX_EVENTS_PER_SECOND batches, coalescing whatever
+# arrived in between, and a keepalive comment after SSE_KEEPALIVE idle seconds.
+PUBSUB_BACKEND = "core.pubsub.LocalPubSub"
+SSE_MAX_EVENTS_PER_SECOND = 2
+SSE_KEEPALIVE = 15
+
 # AUTH_USER_MODEL = 'core.Account'
@@ -1,15 +1,23 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.views.generic import RedirectView
 
+from core.http import serve_media, serve_static
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('core.urls')),
     path('', RedirectView.as_view(pattern_name='post_list', permanent=False)),
+    # Outside DEBUG too: with MEDIA_SERVE_MODE offloading, the proxy sends the bytes.
+    re_path(r'^%s(?P<path>.+)$' % settings.MEDIA_URL.lstrip('/'), serve_media, name='media'),
 ]
 
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file
+    # Straight from the source folders; no collectstatic needed.
+    urlpatterns += staticfiles_urlpatterns()
+else:
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.+)$' % settings.STATIC_URL.lstrip('/'), serve_static, name='static'),
+    ]
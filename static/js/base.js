@@ -0,0 +1,204 @@
+function previewImage(event) {
+  const file = event.target.files[0];
+  if (file) {
+    const reader = new FileReader();
+    reader.onload = function (e) {
+      document.getElementById('previewImg').src = e.target.result;
+      document.getElementById('imagePreview').classList.add('active');
+      removeVideo();
+    };
+    reader.readAsDataURL(file);
+  }
+}
+
+function previewVideo(event) {
+  const file = event.target.files[0];
+  if (file) {
+    const reader = new FileReader();
+    reader.onload = function (e) {
+      document.getElementById('previewVideo').src = e.target.result;
+      document.getElementById('videoPreview').classList.add('active');
+      removeImage();
+    };
+    reader.readAsDataURL(file);
+  }
+}
+
+function removeImage() {
+  document.getElementById('imagePreview').classList.remove('active');
+  document.getElementById('imageInput').value = '';
+  document.getElementById('previewImg').src = '';
+}
+
+function removeVideo() {
+  document.getElementById('videoPreview').classList.remove('active');
+  document.getElementById('videoInput').value = '';
+  document.getElementById('previewVideo').src = '';
+}
+
+const contentInput = document.getElementById('contentInput');
+const submitBtn = document.getElementById('submitBtn');
+
+// Guard: only attach handlers when the post form exists on the page
+if (contentInput && submitBtn) {
+  contentInput.addEventListener('input', function () {
+    submitBtn.disabled = this.value.trim() === '';
+  });
+  submitBtn.disabled = true;
+}
+
+console.log('[base] global scripts loaded');
+// CSRF helper (reads csrftoken cookie)
+function getCookie(name) {
+  let cookieValue = null;
+  if (document.cookie && document.cookie !== '') {
+    const cookies = document.cookie.split(';');
+    for (let i = 0; i < cookies.length; i++) {
+      const cookie = cookies[i].trim();
+      // Does this cookie string begin with the name we want?
+      if (cookie.substring(0, name.length + 1) === (name + '=')) {
+        cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+        break;
+      }
+    }
+  }
+  return cookieValue;
+}
+// Template-friendly react URL base (will render /react/0/ and we'll replace 0)
+const REACT_URL_TEMPLATE = document.body.dataset.reactUrl;
+/* Global reaction modal behavior (available to all pages) */
+(function(){
+  let modal = null;
+  function ensureModal(){
+    console.log('[base] ensureModal called, modal exists?', !!modal);
+    if (modal) return modal;
+    console.log('[base] creating new modal...');
+    modal = document.createElement('div');
+    modal.id = 'reactionModal';
+    modal.className = 'reaction-modal';
+    modal.innerHTML = `
+      <div class="reaction-modal-backdrop" onclick="closeReactionModal()"></div>
+      <div class="reaction-modal-panel" role="dialog" aria-label="Reactions">
+        <div class="reaction-grid">
+          <button class="reaction-item" data-reaction="❤️">❤️</button>
+          <button class="reaction-item" data-reaction="😂">😂</button>
+          <button class="reaction-item" data-reaction="😮">😮</button>
+          <button class="reaction-item" data-reaction="😢">😢</button>
+          <button class="reaction-item" data-reaction="😡">😡</button>
+          <button class="reaction-item" data-reaction="👍">👍</button>
+          <button class="reaction-item" data-reaction="👎">👎</button>
+          <button class="reaction-item" data-reaction="🔥">🔥</button>
+          <button class="reaction-item" data-reaction="🎉">🎉</button>
+          <button class="reaction-item" data-reaction="😍">😍</button>
+          <button class="reaction-item" data-reaction="👏">👏</button>
+          <button class="reaction-item" data-reaction="💯">💯</button>
+        </div>
+      </div>`;
+    try {
+      document.body.appendChild(modal);
+      console.log('[base] modal appended to body');
+      modal.querySelectorAll('.reaction-item').forEach(btn => {
+        btn.addEventListener('click', (e) => {
+          const reaction = btn.dataset.reaction;
+          const postId = modal.dataset.postId;
+          console.log('[base] reaction click', { reaction, postId, btnDefined: !!btn });
+
+          // Optimistic UI
+          try { applyReactionToPost(postId, reaction); } catch (err) { console.error('[base] applyReactionToPost failed', err); }
+          try { animateReactionFly(btn, postId, reaction); } catch (err) { console.error('[base] animateReactionFly failed', err); }
+          closeReactionModal();
+
+          // Send to server (POST JSON) - replace the '0' in the template URL with the postId
+          try {
+            const url = REACT_URL_TEMPLATE.replace('/0/', `/${postId}/`);
+            fetch(url, {
+              method: 'POST',
+              credentials: 'same-origin', // include session cookie
+              headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCookie('csrftoken') || ''
+              },
+              body: JSON.stringify({ reaction })
+            })
+            .then(resp => resp.json())
+            .then(data => console.log('[base] react_to_post response', data))
+            .catch(err => console.error('[base] react_to_post fetch error', err));
+          } catch (err) {
+            console.error('[base] error sending reaction to server', err);
+          }
+        });
+      });
+    } catch (err) {
+      console.error('[base] error appending modal or wiring reaction handlers', err);
+    }
+    return modal;
+  }
+
+  window.openReactionModal = function(postId, btn){
+    console.log('[base] openReactionModal called with', { postId, btnPresent: !!btn });
+    const m = ensureModal();
+    console.log('[base] ensureModal returned', !!m);
+    m.style.display = 'block';
+    m.dataset.postId = postId;
+    const panel = m.querySelector('.reaction-modal-panel');
+    console.log('[base] panel found?', !!panel);
+    if (panel) panel.classList.add('show');
+    const first = m.querySelector('.reaction-item'); 
+    if (first) first.focus();
+    console.log('[base] openReactionModal finished');
+  }
+
+  window.closeReactionModal = function(){
+    const m = modal || document.getElementById('reactionModal');
+    if (!m) return;
+    const panel = m.querySelector('.reaction-modal-panel'); if (panel) panel.classList.remove('show');
+    setTimeout(()=>{ if(m) m.style.display = 'none'; }, 160);
+  }
+
+  window.applyReactionToPost = function(postId, reaction){
+    console.log('[base] applyReactionToPost', { postId, reaction });
+    if (!postId) { console.warn('[base] applyReactionToPost called without postId'); return; }
+
+    // Immediately show optimistic UI
+    const wrapper = document.querySelector(`[data-post-id="${postId}"]`);
+    if (!wrapper) { console.warn('[base] applyReactionToPost: no wrapper found for postId', postId); return; }
+    let disp = wrapper.querySelector('.reaction-display');
+    if (!disp){ disp = document.createElement('div'); disp.className = 'reaction-display'; const stats = wrapper.querySelector('.post-stats'); if(stats) stats.appendChild(disp); }
+    const chip = document.createElement('span'); chip.className = 'reaction-chip'; chip.innerHTML = `${reaction} <span class="reaction-count">1</span>`;
+    disp.innerHTML = ''; disp.appendChild(chip);
+    disp.classList.add('pulse'); setTimeout(()=>disp.classList.remove('pulse'),600);
+
+    // Send reaction to server
+    fetch(`/react/${postId}/`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'X-CSRFToken': document.querySelector('[name=csrfmiddlewaretoken]')?.value || ''
+      },
+      body: JSON.stringify({ reaction: reaction })
+    })
+    .then(r => r.json())
+    .then(data => {
+      console.log('[base] server reaction response', data);
+    })
+    .catch(err => {
+      console.error('[base] reaction POST failed', err);
+    });
+  }
+
+  window.animateReactionFly = function(btnEl, postId, reaction){
+    if (!btnEl) { console.warn('[base] animateReactionFly called with no btnEl', { postId, reaction }); return; }
+    try {
+      const rect = btnEl.getBoundingClientRect();
+      const fly = document.createElement('div'); fly.className = 'reaction-fly'; fly.textContent = reaction;
+      document.body.appendChild(fly);
+      fly.style.left = (rect.left + rect.width/2 - 12) + 'px'; fly.style.top = (rect.top - 4) + 'px';
+      requestAnimationFrame(()=> fly.classList.add('fly'));
+      setTimeout(()=> fly.classList.add('pop'), 140);
+      setTimeout(()=> fly.remove(), 900);
+    } catch (err) {
+      console.error('[base] animateReactionFly error', err);
+    }
+  }
+
+})();
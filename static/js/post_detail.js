@@ -0,0 +1,103 @@
+let currentPostId = null;
+
+function openReactionModal(postId) {
+    currentPostId = postId;
+
+    const modal = document.querySelector(".reaction-modal");
+    const panel = document.querySelector(".reaction-modal-panel");
+
+    modal.style.display = "block";
+    setTimeout(() => panel.classList.add("show"), 10);
+}
+
+function closeReactionModal() {
+    const modal = document.querySelector(".reaction-modal");
+    const panel = document.querySelector(".reaction-modal-panel");
+
+    panel.classList.remove("show");
+    setTimeout(() => {
+        modal.style.display = "none";
+        currentPostId = null;
+    }, 150);
+}
+
+function loadMoreReplies(btn) {
+    const list = document.getElementById("commentList");
+    btn.disabled = true;
+
+    fetch(`${list.dataset.moreUrl}?cursor=${encodeURIComponent(btn.dataset.cursor)}`)
+        .then((res) => res.json())
+        .then((data) => {
+            if (!data.success) return;
+            list.insertAdjacentHTML("beforeend", data.html);
+            if (data.next_cursor) {
+                btn.dataset.cursor = data.next_cursor;
+                btn.disabled = false;
+            } else {
+                btn.remove();
+            }
+        })
+        .catch((err) => {
+            console.error(err);
+            btn.disabled = false;
+        });
+}
+
+/* Live updates from other viewers: reaction totals and new replies */
+(function () {
+    const list = document.getElementById("commentList");
+    // Only rendered when the server can stream (LIVE_UPDATES under ASGI).
+    if (!window.EventSource || !list.dataset.eventsUrl) return;
+    const postId = document.querySelector(".post-wrapper").dataset.postId;
+    const events = new EventSource(list.dataset.eventsUrl);
+
+    events.addEventListener("reactions", (event) => {
+        const data = JSON.parse(event.data);
+        const countEl = document.getElementById(`reactionCount-${postId}`);
+        if (countEl) countEl.textContent = data.reaction_count;
+    });
+
+    events.addEventListener("comments", (event) => {
+        const data = JSON.parse(event.data);
+        const empty = list.querySelector(".no-comments");
+        if (empty) empty.remove();
+        // Replies arrive oldest first; prepending each keeps newest on top.
+        data.html.forEach((html) => list.insertAdjacentHTML("afterbegin", html));
+        const countEl = document.getElementById(`commentCount-${postId}`);
+        if (countEl) countEl.textContent = parseInt(countEl.textContent, 10) + data.html.length;
+    });
+})();
+
+/* THIS is what the modal buttons must call */
+function sendReaction(emoji) {
+    if (!currentPostId) return;
+
+    fetch(`/react/${currentPostId}/`, {
+        method: "POST",
+        headers: {
+            "Content-Type": "application/json",
+            "X-CSRFToken": getCookie("csrftoken"),
+        },
+        body: JSON.stringify({ reaction: emoji }),
+    })
+        .then((res) => res.json())
+        .then((data) => {
+            if (!data.success) return;
+
+            // total reactions
+            const total = data.counts.reduce((sum, r) => sum + r.count, 0);
+
+            const countEl = document.getElementById(`reactionCount-${currentPostId}`);
+
+            if (countEl) {
+                countEl.textContent = total;
+                countEl.parentElement.classList.add("liked");
+                setTimeout(() => {
+                    countEl.parentElement.classList.remove("liked");
+                }, 300);
+            }
+
+            closeReactionModal();
+        })
+        .catch((err) => console.error(err));
+}
@@ -0,0 +1,69 @@
+function previewImage(event) {
+    const file = event.target.files[0];
+    if (!file) return;
+
+    const reader = new FileReader();
+    reader.onload = (e) => {
+        previewImg.src = e.target.result;
+        imagePreview.classList.add("active");
+        removeVideo();
+    };
+    reader.readAsDataURL(file);
+}
+
+function previewVideo(event) {
+    const file = event.target.files[0];
+    if (!file) return;
+
+    const reader = new FileReader();
+    reader.onload = (e) => {
+        previewVideo.src = e.target.result;
+        videoPreview.classList.add("active");
+        removeImage();
+    };
+    reader.readAsDataURL(file);
+}
+
+function removeImage() {
+    imagePreview.classList.remove("active");
+    imageInput.value = "";
+    previewImg.src = "";
+}
+
+function removeVideo() {
+    videoPreview.classList.remove("active");
+    videoInput.value = "";
+    previewVideo.src = "";
+}
+
+function loadMorePosts(btn) {
+    const timeline = document.getElementById("timeline");
+    btn.disabled = true;
+
+    fetch(`${timeline.dataset.moreUrl}?cursor=${encodeURIComponent(btn.dataset.cursor)}`, {
+        credentials: "same-origin",
+    })
+        .then((res) => res.json())
+        .then((data) => {
+            if (!data.success) return;
+            timeline.insertAdjacentHTML("beforeend", data.html);
+            if (data.next_cursor) {
+                btn.dataset.cursor = data.next_cursor;
+                btn.disabled = false;
+            } else {
+                btn.remove();
+            }
+        })
+        .catch((err) => {
+            console.error(err);
+            btn.disabled = false;
+        });
+}
+
+const contentInput = document.getElementById("contentInput");
+const submitBtn = document.getElementById("submitBtn");
+
+contentInput.addEventListener("input", () => {
+    submitBtn.disabled = contentInput.value.trim() === "";
+});
+submitBtn.disabled = true;
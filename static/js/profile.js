@@ -0,0 +1,133 @@
+function loadMoreProfilePosts(btn) {
+  const list = document.getElementById('profilePosts');
+  btn.disabled = true;
+  fetch(`${list.dataset.moreUrl}?cursor=${encodeURIComponent(btn.dataset.cursor)}`)
+    .then((res) => res.json())
+    .then((data) => {
+      if (!data.success) return;
+      list.insertAdjacentHTML('beforeend', data.html);
+      hydrateReactions();
+      if (data.next_cursor) {
+        btn.dataset.cursor = data.next_cursor;
+        btn.disabled = false;
+      } else {
+        btn.remove();
+      }
+    })
+    .catch((err) => {
+      console.error(err);
+      btn.disabled = false;
+    });
+}
+
+/* Fill in every card's reaction chips, one request per batch of cards */
+function hydrateReactions() {
+  const list = document.getElementById('profilePosts');
+  if (!list) return;
+  const displays = Array.from(list.querySelectorAll('.reaction-display[data-post-id]:not([data-hydrated])'));
+  for (let i = 0; i < displays.length; i += 100) {
+    const batch = displays.slice(i, i + 100);
+    batch.forEach((disp) => { disp.dataset.hydrated = '1'; });
+    const ids = batch.map((disp) => disp.dataset.postId).join(',');
+    fetch(`${list.dataset.reactionsUrl}?ids=${ids}`, { credentials: 'same-origin' })
+      .then((res) => res.json())
+      .then((data) => {
+        if (!data.success) return;
+        batch.forEach((disp) => {
+          const state = data.reactions[disp.dataset.postId];
+          if (!state) return;
+          disp.innerHTML = '';
+          state.counts
+            .slice()
+            .sort((a, b) => b.count - a.count)
+            .slice(0, 3)
+            .forEach((r) => {
+              const chip = document.createElement('span');
+              chip.className = 'reaction-chip' + (r.reaction_type === state.user_reaction ? ' mine' : '');
+              chip.textContent = `${r.reaction_type} `;
+              const count = document.createElement('span');
+              count.className = 'reaction-count';
+              count.textContent = r.count;
+              chip.appendChild(count);
+              disp.appendChild(chip);
+            });
+          const total = disp.closest('.post-stats')?.querySelector('.like-btn .stat-count');
+          if (total) total.textContent = state.reaction_count;
+        });
+      })
+      .catch((err) => console.error(err));
+  }
+}
+
+hydrateReactions();
+
+(function(){
+  let modal = null;
+  function ensureModal(){
+    if (modal) return modal;
+    modal = document.createElement('div');
+    modal.id = 'reactionModal';
+    modal.className = 'reaction-modal';
+    modal.innerHTML = `
+      <div class="reaction-modal-backdrop" onclick="closeReactionModal()"></div>
+      <div class="reaction-modal-panel" role="dialog" aria-label="Reactions">
+        <div class="reaction-grid">
+          <button class="reaction-item" data-reaction="❤️">❤️</button>
+          <button class="reaction-item" data-reaction="😂">😂</button>
+          <button class="reaction-item" data-reaction="😮">😮</button>
+          <button class="reaction-item" data-reaction="😢">😢</button>
+          <button class="reaction-item" data-reaction="😡">😡</button>
+          <button class="reaction-item" data-reaction="👍">👍</button>
+          <button class="reaction-item" data-reaction="👎">👎</button>
+          <button class="reaction-item" data-reaction="🔥">🔥</button>
+          <button class="reaction-item" data-reaction="🎉">🎉</button>
+          <button class="reaction-item" data-reaction="😍">😍</button>
+          <button class="reaction-item" data-reaction="👏">👏</button>
+          <button class="reaction-item" data-reaction="💯">💯</button>
+        </div>
+      </div>`;
+    document.body.appendChild(modal);
+    modal.querySelectorAll('.reaction-item').forEach(btn => {
+      btn.addEventListener('click', () => {
+        const reaction = btn.dataset.reaction;
+        const postId = modal.dataset.postId;
+        applyReactionToPost(postId, reaction);
+        animateReactionFly(btn, postId, reaction);
+        closeReactionModal();
+      });
+    });
+    return modal;
+  }
+  window.openReactionModal = function(postId, btn){
+    const m = ensureModal();
+    m.style.display = 'block';
+    m.dataset.postId = postId;
+    const panel = m.querySelector('.reaction-modal-panel');
+    panel.classList.add('show');
+    const first = m.querySelector('.reaction-item'); if (first) first.focus();
+  }
+  window.closeReactionModal = function(){
+    const m = modal || document.getElementById('reactionModal');
+    if (!m) return;
+    const panel = m.querySelector('.reaction-modal-panel'); if (panel) panel.classList.remove('show');
+    setTimeout(()=>{ if(m) m.style.display = 'none'; }, 160);
+  }
+  window.applyReactionToPost = function(postId, reaction){
+    const wrapper = document.querySelector(`[data-post-id="${postId}"]`);
+    if (!wrapper) return;
+    let disp = wrapper.querySelector('.reaction-display');
+    if (!disp){ disp = document.createElement('div'); disp.className = 'reaction-display'; const stats = wrapper.querySelector('.post-stats'); if(stats) stats.appendChild(disp); }
+    const chip = document.createElement('span'); chip.className = 'reaction-chip'; chip.innerHTML = `${reaction} <span class="reaction-count">1</span>`;
+    disp.innerHTML = ''; disp.appendChild(chip);
+    disp.classList.add('pulse'); setTimeout(()=>disp.classList.remove('pulse'),600);
+  }
+  window.animateReactionFly = function(btnEl, postId, reaction){
+    const rect = btnEl.getBoundingClientRect();
+    const fly = document.createElement('div'); fly.className = 'reaction-fly'; fly.textContent = reaction;
+    document.body.appendChild(fly);
+    fly.style.left = (rect.left + rect.width/2 - 12) + 'px'; fly.style.top = (rect.top - 4) + 'px';
+    requestAnimationFrame(()=> fly.classList.add('fly'));
+    setTimeout(()=> fly.classList.add('pop'), 140);
+    setTimeout(()=> fly.remove(), 900);
+  }
+})();